@@ -4,10 +4,12 @@ The primary application script for Alien Invaders
 This is the module with the application code.  Make sure that this module is
 in a folder with the following files:
 
-    app.py      (the primary controller class)
-    level.py    (the subcontroller for a single game level)
-    models.py   (the model classes)
-    consts.py   (the application constants)
+    app.py       (the primary controller class)
+    wave.py      (the subcontroller for a single game level)
+    formation.py (the state of the aliens in a level)
+    models.py    (the model classes)
+    waveview.py  (the view drawing a single game level)
+    consts.py    (the application constants)
 
 In addition, you should have the following subfolders
 
@@ -25,4 +27,5 @@ from app import *
 
 # Application code
 if __name__ == '__main__':
-    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,tick=GAME_TICK,\
+    retained=True,atlas=True).run()
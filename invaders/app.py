@@ -13,6 +13,7 @@ question on Piazza.
 from consts import *
 from game2d import *
 from wave import *
+from waveview import *
 
 
 # PRIMARY RULE: Invaders can only access attributes in wave.py via getters/setters
@@ -38,7 +39,8 @@ class Invaders(GameApp):
 
     Most of the work handling the game is actually provided in the class Wave.
     Wave should be modeled after subcontrollers.py from lecture, and will
-    have its own update and draw method.
+    have its own update method. Wave does not use Kivy, so it is drawn by
+    a WaveView, which has its own draw method.
 
     The primary purpose of this class is to manage the game state: which is
     when the game started, paused, completed, etc. It keeps track of that in
@@ -62,10 +64,19 @@ class Invaders(GameApp):
     # Invariant: _wave is a Wave object, or None if there is no wave currently
     # active. It is only None if _state is STATE_INACTIVE.
     #
+    # Attribute _waveView: the view drawing the current wave
+    # Invariant: _waveView is a WaveView object mirroring _wave, or None if
+    # _wave is None.
+    #
     # Attribute _text: the currently active message
     # Invariant: _text is a GLabel object, or None if there is no message to
     # display. It is onl None if _state is STATE_ACTIVE.
     #
+    # Attribute _shownText: the message last drawn to the view
+    # Invariant: _shownText is a GLabel object, or None if no message is
+    # shown. The game is retained (see GameApp.retained), so it stays on
+    # screen until it is erased.
+    #
     # You may have new attributes if you wish (you might want an attribute to
     # store any score across multiple waves). But you must document them.
     # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
@@ -78,6 +89,16 @@ class Invaders(GameApp):
     # Attribute _alienSpeed: The alien speed (adjusted for waves)
     # Invariant: _alienSpeed is a float
     #
+    # Attribute _score: the aliens killed in the waves won before this one
+    # Invariant: _score is an int >= 0. It is 0 after a wave is lost.
+    #
+    # Attribute _waveNumber: the number of the current wave, starting at 1
+    # Invariant: _waveNumber is an int >= 0. It is 0 before the first wave.
+    #
+    # Attribute _hud: the score, lives and wave display
+    # Invariant: _hud is a GText object. It is drawn whenever there is a
+    # wave, and its text is only changed when one of the numbers changes.
+    #
     # DO NOT MAKE A NEW INITIALIZER!
 
     # THREE MAIN GAMEAPP METHODS
@@ -97,14 +118,24 @@ class Invaders(GameApp):
         """
         self._state = STATE_INACTIVE
         self._wave = None
+        self._waveView = None
         self._lastkeys = None
         self._endMessage = None
         self._alienSpeed = ALIEN_SPEED
+        self._score = 0
+        self._waveNumber = 0
+        self._hud = GText(font_name=HUD_FONT,font_size=HUD_FONT_SIZE,\
+        linecolor=HUD_COLOR,halign='left',x=HUD_MARGIN,\
+        y=GAME_HEIGHT-HUD_MARGIN-HUD_FONT_SIZE/2)
+        self.view.add_layer(LAYER_STATIC)
+        self.view.add_layer(LAYER_FORMATION)
         if self._state == STATE_INACTIVE:
-            self._text = GLabel(text="Press 'S' to Play",\
+            self._text = GLabel.cached(text="Press 'S' to Play",\
             font_size=30,x=GAME_WIDTH//2,y=GAME_HEIGHT//2)
         else:
             self._text = None
+        self._shownText = None
+        self._setIdle()
 
     def update(self,dt):
         """
@@ -154,6 +185,11 @@ class Invaders(GameApp):
         You are allowed to add more states if you wish. Should you do so, you should
         describe them here.
 
+        Only STATE_ACTIVE and the one-frame states in between animate at the
+        full frame rate. STATE_INACTIVE, STATE_PAUSED and STATE_COMPLETE only
+        wait for a key, so the game is idle in them (see GameApp.idle), and a
+        frame is only animated when a key is pressed or released.
+
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
@@ -179,6 +215,8 @@ class Invaders(GameApp):
         if self._state == STATE_COMPLETE:
             self._helperComplete()
 
+        self._setIdle()
+
     def draw(self):
         """
         Draws the game objects to the view.
@@ -188,27 +226,60 @@ class Invaders(GameApp):
         that easy!
 
         Many of the GObjects (such as the ships, aliens, and bolts) are
-        attributes in Wave. In order to draw them, you either need to add
-        getters for these attributes or you need to add a draw method to
-        class Wave.  We suggest the latter.  See the example subcontroller.py
-        from class.
+        attributes in Wave. They are drawn by the WaveView mirroring the
+        wave, which reads them through getters in Wave.
+
+        The game is retained, so the view is not cleared between frames. A
+        message that was replaced is erased, and the wave is erased when it
+        is not active.
+
+        While there is a wave, the score, lives and wave number are shown at
+        the top of the screen. They are drawn from a glyph atlas (GText), so
+        a new score only moves a few quads instead of rendering text.
+
+        The barriers, the defense line and the aliens are drawn to cached
+        layers of the view (see start), which are only rendered again when
+        they change. Most frames only render the ship, the bolts and the HUD.
         """
         # IMPLEMENT ME
+        if self._shownText is not self._text:
+            if self._shownText is not None:
+                self._shownText.erase(self.view)
+            self._shownText = self._text
         if self._text is not None:
             self._text.draw(self.view)
 
         if self._state == STATE_ACTIVE:
-            self._wave.draw(self.view)
+            self._waveView.draw(self.view,self.alpha)
+        elif self._waveView is not None:
+            self._waveView.erase(self.view)
+
+        if self._wave is not None:
+            self._hud.text = 'SCORE '+str(self._score+self._wave.getKills())+\
+            '  LIVES '+str(self._wave.getLives())+'  WAVE '+str(self._waveNumber)
+            self._hud.draw(self.view)
 
     # HELPER METHODS FOR THE STATES GO HERE
+    def _setIdle(self):
+        """
+        Makes the game idle in the states that only wait for a key.
+
+        These are STATE_INACTIVE, STATE_PAUSED and STATE_COMPLETE. In every
+        other state the game animates at the full frame rate.
+        """
+        self.idle = self._state in (STATE_INACTIVE,STATE_PAUSED,STATE_COMPLETE)
+
     def _helperNewwave(self):
         """
         Executes all the tasks needed when a new wave is created
 
         When the state is STATE_NEWWAVE, creates a Wave object and stores it
-        in self._wave. Changes the state to STATE_ACTIVE
+        in self._wave, along with a WaveView to draw it in self._waveView.
+        Changes the state to STATE_ACTIVE
         """
         self._wave = Wave()
+        self._waveView = WaveView(self._wave)
+        self._waveNumber += 1
         self._state = STATE_ACTIVE
 
     def _helperActive(self, dt):
@@ -236,7 +307,7 @@ class Invaders(GameApp):
                 waveEndMessage = "You lose! Press S to restart."
             self._state = STATE_COMPLETE
 
-            self._text = GLabel(text=waveEndMessage,\
+            self._text = GLabel.cached(text=waveEndMessage,\
             font_size=30,x=GAME_WIDTH//2,y=GAME_HEIGHT//2)
 
     def _helperPaused(self):
@@ -252,7 +323,7 @@ class Invaders(GameApp):
             l = " lives" if self._wave.getLives()>1 else ' life'
             t = "You have "+str(self._wave.getLives())+ l+\
             " left. Press 'S' to Continue"
-            self._text = GLabel(text=t\
+            self._text = GLabel.cached(text=t\
             ,font_size=30,x=GAME_WIDTH//2,y=GAME_HEIGHT//2)
 
         if 's' in self.input.keys:
@@ -266,8 +337,10 @@ class Invaders(GameApp):
 
         When the wave is WAVE_COMPLETE, waits for the key s to be pressed.
         If s is pressed, then changes state to new wave, so that a new wave
-        is created. If the player wins the wave, then the speed is incremented.
-        Otherwise, if player loses, speed is set back to ALIEN_SPEED.
+        is created. If the player wins the wave, then the speed is incremented
+        and the kills are added to the score. Otherwise, if player loses,
+        speed is set back to ALIEN_SPEED, and the score and wave number start
+        over.
         """
         if 's' in self.input.keys:
             #print(self._wave.getGameOverStatus())
@@ -275,5 +348,8 @@ class Invaders(GameApp):
             self._text = None
             if self._wave.getGameOverStatus() == 'win':
                 self._alienSpeed *= ALIEN_SPEED_INCREASE
+                self._score += self._wave.getKills()
             elif self._wave.getGameOverStatus() == 'lose':
                 self._alienSpeed = ALIEN_SPEED
+                self._score = 0
+                self._waveNumber = 0
@@ -0,0 +1,592 @@
+"""
+Batch simulation module for Alien Invaders
+
+This module contains the class WaveBatch, which advances many independent
+waves in lockstep. It follows the same rules as Wave (see wave.py), but
+instead of one object per wave it keeps the state of every wave in stacked
+NumPy arrays, with the wave index as the first axis. A call to step moves
+every wave forward one frame with a handful of array operations, which is
+what agent training needs to reach millions of frames per hour on a CPU.
+
+Like Wave, this module never imports Kivy. There is nothing to draw; the
+waves are observed through the arrays returned by step.
+
+The player controls each wave with an action, which is one of the ACTION
+constants below. The ship is never paused after it is hit: play simply
+continues until the wave is won or lost.
+"""
+from consts import *
+import numpy as np
+
+#: do nothing this frame
+ACTION_NONE       = 0
+#: move the ship left
+ACTION_LEFT       = 1
+#: move the ship right
+ACTION_RIGHT      = 2
+#: fire a bolt from the ship
+ACTION_FIRE       = 3
+#: move the ship left and fire
+ACTION_LEFT_FIRE  = 4
+#: move the ship right and fire
+ACTION_RIGHT_FIRE = 5
+#: the number of distinct actions
+ACTION_COUNT      = 6
+
+#: the reward for each alien killed
+BATCH_KILL_REWARD = 1.0
+#: the reward for each life lost
+BATCH_DEATH_REWARD = -1.0
+
+#: status of a wave still in play
+BATCH_PLAYING = 0
+#: status of a wave the player won
+BATCH_WIN     = 1
+#: status of a wave the player lost
+BATCH_LOSE    = 2
+
+# Alien directions, in the same order as the strings used by Wave
+_DIR_RIGHT      = 0
+_DIR_LEFT       = 1
+_DIR_RIGHT_DOWN = 2
+_DIR_LEFT_DOWN  = 3
+
+
+class WaveBatch(object):
+    """
+    A class to simulate N independent waves of Alien Invaders at once.
+
+    Each frame follows Wave.update: the ship moves, the formation walks
+    (firing an alien bolt every few walks), the player fires, bolts that
+    left the screen are removed, and the remaining bolts move. As in
+    Wave._boltHit, the whole path of each bolt is then tested against the
+    barriers, the aliens and the ship, and only the one it reaches first is
+    hit (ties go to them in that order).
+    A wave is over when the aliens are all dead, when they cross the
+    defense line, or when the ship runs out of lives.
+
+    A wave that is over is frozen (step leaves it alone and gives it a
+    reward of 0) until it is started over with reset.
+
+    Each wave has room for maxBolts alien bolts at a time. If an alien fires
+    while all of the room is taken, the bolt is not fired. With the default
+    room this does not happen at the alien speeds used by the game.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _n: the number of waves
+    # Invariant: _n is an int > 0
+    #
+    # Attribute _dt: the time in seconds of one frame
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _speed: the number of seconds between alien walks, per wave
+    # Invariant: _speed is an (N,) array of float > 0
+    #
+    # Attribute _random: the source of random numbers for all waves
+    # Invariant: _random is a NumPy Generator
+    #
+    # Attribute _alive: whether each alien of each wave is alive
+    # Invariant: _alive is an (N,ALIEN_ROWS,ALIENS_IN_ROW) array of bool
+    #
+    # Attribute _walkX, _walkY: the distance each formation has walked
+    # Invariant: _walkX and _walkY are (N,) arrays of float
+    #
+    # Attribute _alienDir: the direction each formation is walking
+    # Invariant: _alienDir is an (N,) array of _DIR constants
+    #
+    # Attribute _time: the time since the last walk of each formation
+    # Invariant: _time is an (N,) array of float >= 0
+    #
+    # Attribute _walks: the walks of each formation since it last fired
+    # Invariant: _walks is an (N,) array of int, 0 <= _walks <= _fireRate
+    #
+    # Attribute _fireRate: the walks each formation makes before it fires
+    # Invariant: _fireRate is an (N,) array of int, 1 <= _fireRate <= BOLT_RATE
+    #
+    # Attribute _shipX: the x coordinate of each ship
+    # Invariant: _shipX is an (N,) array of float
+    #
+    # Attribute _lives: the lives left in each wave
+    # Invariant: _lives is an (N,) array of int >= 0
+    #
+    # Attribute _health: the health of each barrier of each wave
+    # Invariant: _health is an (N,2) array of float; <= 0 means destroyed
+    #
+    # Attribute _pActive, _pX, _pY: the player bolt of each wave
+    # Invariant: _pActive is an (N,) array of bool; _pX and _pY are (N,)
+    # arrays of float, only meaningful where _pActive is True
+    #
+    # Attribute _aActive, _aX, _aY: the alien bolts of each wave
+    # Invariant: _aActive is an (N,maxBolts) array of bool; _aX and _aY are
+    # (N,maxBolts) arrays of float, only meaningful where _aActive is True
+    #
+    # Attribute _status: the status of each wave
+    # Invariant: _status is an (N,) array of BATCH_PLAYING, BATCH_WIN or
+    # BATCH_LOSE
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getSize(self):
+        """
+        Returns the number of waves in the batch
+        """
+        return self._n
+
+    def getLives(self):
+        """
+        Returns a copy of the lives left in each wave
+        """
+        return self._lives.copy()
+
+    def getStatus(self):
+        """
+        Returns a copy of the status (a BATCH constant) of each wave
+        """
+        return self._status.copy()
+
+    def getAlive(self):
+        """
+        Returns a copy of the (N,ALIEN_ROWS,ALIENS_IN_ROW) alive tensor
+        """
+        return self._alive.copy()
+
+    def getShipX(self):
+        """
+        Returns a copy of the x coordinate of each ship
+        """
+        return self._shipX.copy()
+
+    # INITIALIZER TO CREATE THE WAVES
+    def __init__(self,n,alienSpeed=ALIEN_SPEED,dt=1/60,maxBolts=16,seed=None):
+        """
+        Initializes n new waves.
+
+        Parameter n: The number of waves
+        Precondition: n is an int > 0
+
+        Parameter alienSpeed: The seconds between alien walks
+        Precondition: alienSpeed is an int or float > 0, or an array of n
+        such numbers (one per wave)
+
+        Parameter dt: The time in seconds of one frame
+        Precondition: dt is an int or float > 0
+
+        Parameter maxBolts: The most alien bolts a wave can have at once
+        Precondition: maxBolts is an int > 0
+
+        Parameter seed: The seed for the random numbers
+        Precondition: seed is an int or None
+        """
+        assert type(n) == int and n > 0
+        assert type(dt) in [int,float] and dt > 0
+        assert type(maxBolts) == int and maxBolts > 0
+        self._n = n
+        self._dt = float(dt)
+        self._speed = np.zeros(n) + alienSpeed
+        assert (self._speed > 0).all()
+        self._random = np.random.default_rng(seed)
+
+        shape = (ALIEN_ROWS,ALIENS_IN_ROW)
+        self._alive = np.ones((n,)+shape,dtype=bool)
+        self._walkX = np.zeros(n)
+        self._walkY = np.zeros(n)
+        self._alienDir = np.zeros(n,dtype=int)
+        self._time = np.zeros(n)
+        self._walks = np.zeros(n,dtype=int)
+        self._fireRate = np.ones(n,dtype=int)
+        self._shipX = np.zeros(n)
+        self._lives = np.zeros(n,dtype=int)
+        self._health = np.zeros((n,2))
+        self._pActive = np.zeros(n,dtype=bool)
+        self._pX = np.zeros(n)
+        self._pY = np.zeros(n)
+        self._aActive = np.zeros((n,maxBolts),dtype=bool)
+        self._aX = np.zeros((n,maxBolts))
+        self._aY = np.zeros((n,maxBolts))
+        self._status = np.zeros(n,dtype=int)
+
+        # The geometry shared by every wave
+        self._alienX0 = ALIEN_H_SEP + 0.5*ALIEN_WIDTH
+        self._alienY0 = (GAME_HEIGHT-ALIEN_CEILING) - 0.5*ALIEN_HEIGHT
+        self._barrierX = np.array([GAME_WIDTH/3,2*GAME_WIDTH/3])
+        self._index = np.arange(n)
+        self.reset()
+
+    # METHODS TO START AND ADVANCE THE WAVES
+    def reset(self,envs=None):
+        """
+        Starts the given waves over and returns the observation of the batch.
+
+        Parameter envs: The waves to start over
+        Precondition: envs is None (for all waves), an array of wave indices,
+        or an (N,) array of bool
+        """
+        if envs is None:
+            envs = self._index
+        self._alive[envs] = True
+        self._walkX[envs] = 0
+        self._walkY[envs] = 0
+        self._alienDir[envs] = _DIR_RIGHT
+        self._time[envs] = 0
+        self._walks[envs] = 0
+        self._shipX[envs] = GAME_WIDTH/2
+        self._lives[envs] = SHIP_LIVES
+        self._health[envs] = BARRIER_HEALTH
+        self._pActive[envs] = False
+        self._aActive[envs] = False
+        self._status[envs] = BATCH_PLAYING
+        count = len(self._index[envs])
+        self._fireRate[envs] = self._random.integers(1,BOLT_RATE,count,
+            endpoint=True)
+        return self.observe()
+
+    def step(self,actions):
+        """
+        Advances every wave in play by one frame.
+
+        Returns a tuple (observation, rewards, dones). The rewards are an (N,)
+        array of float: BATCH_KILL_REWARD for every alien killed plus
+        BATCH_DEATH_REWARD for every life lost this frame. The dones are an
+        (N,) array of bool that is True for every wave that is over.
+
+        Parameter actions: The action of the player in each wave
+        Precondition: actions is an (N,) array-like of ACTION constants
+        """
+        actions = np.asarray(actions)
+        assert actions.shape == (self._n,)
+        playing = self._status == BATCH_PLAYING
+        kills = np.zeros(self._n)
+        lives = self._lives.copy()
+
+        self._updateShips(actions,playing)
+        marching = playing & self._alive.any(axis=(1,2))
+        self._moveAliens(marching)
+        firing = marching & (self._walks == self._fireRate)
+        self._createAlienBolts(firing)
+        self._walks[firing] = 0
+        fire = (actions == ACTION_FIRE) | (actions == ACTION_LEFT_FIRE) |\
+            (actions == ACTION_RIGHT_FIRE)
+        self._createPlayerBolts(fire & playing)
+        self._removeBolts(playing)
+        self._updateBolts(playing)
+        kills += self._collideBolts(playing)
+        self._updateStatus(playing)
+
+        rewards = BATCH_KILL_REWARD*kills + \
+            BATCH_DEATH_REWARD*(lives-self._lives)
+        return (self.observe(),rewards,self._status != BATCH_PLAYING)
+
+    def observe(self):
+        """
+        Returns the observation of every wave as an (N,D) float32 array.
+
+        Each row holds, in order: the alive flags of the formation (row by
+        row), the walk offset of the formation, the ship x, the lives left,
+        the player bolt (active, x, y) and each alien bolt (active, x, y).
+        Coordinates are divided by the size of the window, and lives by
+        SHIP_LIVES, so every value is roughly in the range -1..1.
+        """
+        parts = [self._alive.reshape(self._n,-1),
+            (self._walkX/GAME_WIDTH)[:,None],
+            (self._walkY/GAME_HEIGHT)[:,None],
+            (self._shipX/GAME_WIDTH)[:,None],
+            (self._lives/SHIP_LIVES)[:,None],
+            self._pActive[:,None],
+            (self._pX/GAME_WIDTH)[:,None],
+            (self._pY/GAME_HEIGHT)[:,None],
+            np.stack([self._aActive,self._aX/GAME_WIDTH,
+                self._aY/GAME_HEIGHT],axis=2).reshape(self._n,-1)]
+        return np.concatenate(parts,axis=1).astype(np.float32)
+
+    # HELPER METHODS (ONE PER STEP OF Wave.update)
+    def _updateShips(self,actions,playing):
+        """
+        Moves each ship by SHIP_MOVEMENT if its action says so (as in
+        Wave._updateShip).
+
+        Parameter actions: The action of the player in each wave
+        Precondition: actions is an (N,) array of ACTION constants
+
+        Parameter playing: Whether each wave is in play
+        Precondition: playing is an (N,) array of bool
+        """
+        left = playing & ((actions == ACTION_LEFT) |
+            (actions == ACTION_LEFT_FIRE))
+        right = playing & ((actions == ACTION_RIGHT) |
+            (actions == ACTION_RIGHT_FIRE))
+        left &= self._shipX - 0.5*SHIP_WIDTH - SHIP_MOVEMENT >= 0
+        right &= self._shipX + 0.5*SHIP_WIDTH + SHIP_MOVEMENT <= GAME_WIDTH
+        self._shipX[left] -= SHIP_MOVEMENT
+        self._shipX[right] += SHIP_MOVEMENT
+
+    def _moveAliens(self,marching):
+        """
+        Walks each formation whose time is up and switches its direction
+        (as in Wave._moveAliens and Wave._switchAlienDir).
+
+        Parameter marching: Whether each formation may walk this frame
+        Precondition: marching is an (N,) array of bool
+        """
+        self._time[marching] += self._dt
+        walk = marching & (self._time > self._speed)
+        self._walks[walk] += 1
+
+        d = self._alienDir
+        self._walkX[walk & (d == _DIR_RIGHT)] += ALIEN_H_WALK
+        self._walkX[walk & (d == _DIR_LEFT)] -= ALIEN_H_WALK
+        self._walkY[walk & (d >= _DIR_RIGHT_DOWN)] -= ALIEN_V_WALK
+
+        cols = self._alive.any(axis=1)
+        pitch = ALIEN_WIDTH+ALIEN_H_SEP
+        leftCol = cols.argmax(axis=1)
+        rghtCol = cols.shape[1]-1-cols[:,::-1].argmax(axis=1)
+        leftEdge = self._alienX0 + leftCol*pitch + self._walkX - ALIEN_WIDTH/2
+        rghtEdge = self._alienX0 + rghtCol*pitch + self._walkX + ALIEN_WIDTH/2
+
+        turn = ((rghtEdge+ALIEN_H_WALK > GAME_WIDTH-ALIEN_H_SEP) |
+            (leftEdge-ALIEN_H_WALK < ALIEN_H_SEP))
+        newDir = d.copy()
+        newDir[d == _DIR_RIGHT_DOWN] = _DIR_LEFT
+        newDir[d == _DIR_LEFT_DOWN] = _DIR_RIGHT
+        newDir[(d < _DIR_RIGHT_DOWN) & turn] += 2
+        self._alienDir[walk] = newDir[walk]
+        self._time[walk] = 0
+
+    def _createAlienBolts(self,firing):
+        """
+        Fires a bolt from the bottom alien of a random live column of each
+        firing formation (as in Wave._createAlienBolts).
+
+        Parameter firing: Whether each formation fires this frame
+        Precondition: firing is an (N,) array of bool
+        """
+        envs = np.flatnonzero(firing)
+        if len(envs) == 0:
+            return
+        cols = self._alive[envs].any(axis=1)
+        col = np.where(cols,self._random.random(cols.shape),-1).argmax(axis=1)
+        column = self._alive[envs,:,col]
+        row = column.shape[1]-1-column[:,::-1].argmax(axis=1)
+        x = self._alienX0 + col*(ALIEN_WIDTH+ALIEN_H_SEP) + self._walkX[envs]
+        y = self._alienY0 - row*(ALIEN_HEIGHT+ALIEN_V_SEP) + self._walkY[envs]
+
+        free = ~self._aActive[envs]
+        room = free.any(axis=1)
+        slot = free.argmax(axis=1)
+        envs, slot = envs[room], slot[room]
+        self._aActive[envs,slot] = True
+        self._aX[envs,slot] = x[room]
+        self._aY[envs,slot] = (y - ALIEN_HEIGHT/2 - BOLT_HEIGHT/2)[room]
+        self._fireRate[firing] = self._random.integers(1,BOLT_RATE,
+            int(firing.sum()),endpoint=True)
+
+    def _createPlayerBolts(self,fire):
+        """
+        Fires a bolt from each ship that fires and has no bolt on screen
+        (as in Wave._createPlayerBolt).
+
+        Parameter fire: Whether each ship tries to fire this frame
+        Precondition: fire is an (N,) array of bool
+        """
+        new = fire & ~self._pActive
+        self._pActive |= new
+        self._pX[new] = self._shipX[new]
+        self._pY[new] = SHIP_BOTTOM + SHIP_HEIGHT + BOLT_HEIGHT/2
+
+    def _removeBolts(self,playing):
+        """
+        Removes the bolts of each wave in play that went past the top or
+        bottom of the screen (as in Wave._boltOffScreen).
+
+        Parameter playing: Whether each wave is in play
+        Precondition: playing is an (N,) array of bool
+        """
+        self._pActive &= ~(playing & ((self._pY - BOLT_HEIGHT/2 > GAME_HEIGHT) |
+            (self._pY + BOLT_HEIGHT/2 < 0)))
+        self._aActive &= ~(playing[:,None] &
+            ((self._aY - BOLT_HEIGHT/2 > GAME_HEIGHT) |
+            (self._aY + BOLT_HEIGHT/2 < 0)))
+
+    def _updateBolts(self,playing):
+        """
+        Moves the bolts of each wave in play by BOLT_SPEED (as in
+        Wave._updateBolts).
+
+        Parameter playing: Whether each wave is in play
+        Precondition: playing is an (N,) array of bool
+        """
+        self._pY[playing & self._pActive] += BOLT_SPEED
+        self._aY[playing[:,None] & self._aActive] -= BOLT_SPEED
+
+    def _collideBolts(self,playing):
+        """
+        Carries out the first hit of every bolt of each wave in play (as in
+        Wave._boltHit). Returns the number of aliens killed in each wave as
+        an (N,) array.
+
+        A bolt that hits a barrier damages it, a player bolt that hits an
+        alien kills it, and an alien bolt that hits a ship takes a life. The
+        bolt is then removed. The bolts are handled one slot at a time, so
+        that a barrier destroyed by one bolt does not stop a later bolt in
+        the same frame.
+
+        Parameter playing: Whether each wave is in play
+        Precondition: playing is an (N,) array of bool
+        """
+        kills = np.zeros(self._n)
+        live = playing & self._pActive
+        if live.any():
+            lastY = self._pY-BOLT_SPEED
+            (barrier, toBarrier) = self._hitBarriers(self._pX,lastY,self._pY)
+            (row, col, toAlien) = self._hitAliens(self._pX,lastY,self._pY)
+            barrierFirst = live & (toBarrier <= toAlien) & (toBarrier < np.inf)
+            alienFirst = live & ~barrierFirst & (toAlien < np.inf)
+            self._damage(barrierFirst,barrier)
+            envs = np.flatnonzero(alienFirst)
+            self._alive[envs,row[envs],col[envs]] = False
+            kills[envs] = 1
+            self._pActive &= ~(barrierFirst | alienFirst)
+
+        for k in range(self._aActive.shape[1]):
+            live = playing & self._aActive[:,k]
+            if not live.any():
+                continue
+            x = self._aX[:,k]
+            y = self._aY[:,k]
+            lastY = y+BOLT_SPEED
+            (barrier, toBarrier) = self._hitBarriers(x,lastY,y)
+            toShip = _sweep(x,lastY,y,self._shipX,SHIP_BOTTOM+SHIP_HEIGHT/2,
+                SHIP_WIDTH,SHIP_HEIGHT)
+            barrierFirst = live & (toBarrier <= toShip) & (toBarrier < np.inf)
+            shipFirst = live & ~barrierFirst & (toShip < np.inf)
+            self._damage(barrierFirst,barrier)
+            self._lives[shipFirst] -= 1
+            self._aActive[:,k] &= ~(barrierFirst | shipFirst)
+        np.maximum(self._lives,0,out=self._lives)
+        return kills
+
+    def _hitBarriers(self,x,lastY,y):
+        """
+        Returns the barrier each bolt reaches first, and how far it moved
+        before reaching it, as a pair of (N,) arrays.
+
+        The distance is inf (and the barrier meaningless) for a bolt that
+        reaches no barrier that is still standing.
+
+        Parameter x: The x coordinate of one bolt of each wave
+        Precondition: x is an (N,) array of float
+
+        Parameter lastY: The y coordinate of that bolt before it moved
+        Precondition: lastY is an (N,) array of float
+
+        Parameter y: The y coordinate of that bolt after it moved
+        Precondition: y is an (N,) array of float
+        """
+        distance = _sweep(x[:,None],lastY[:,None],y[:,None],self._barrierX,
+            BARRIER_Y,BARRIER_WIDTH,BARRIER_HEIGHT)
+        distance[self._health <= 0] = np.inf
+        barrier = distance.argmin(axis=1)
+        return (barrier,distance[np.arange(self._n),barrier])
+
+    def _hitAliens(self,x,lastY,y):
+        """
+        Returns the live alien each player bolt reaches first, and how far
+        it moved before reaching it, as three (N,) arrays (row, col and
+        distance).
+
+        As in Formation.sweep, only the column under the bolt is tested. The
+        distance is inf (and the row and col meaningless) for a bolt that
+        reaches no live alien.
+
+        Parameter x: The x coordinate of the player bolt of each wave
+        Precondition: x is an (N,) array of float
+
+        Parameter lastY: The y coordinate of that bolt before it moved
+        Precondition: lastY is an (N,) array of float
+
+        Parameter y: The y coordinate of that bolt after it moved
+        Precondition: y is an (N,) array of float
+        """
+        pitchX = ALIEN_WIDTH+ALIEN_H_SEP
+        pitchY = ALIEN_HEIGHT+ALIEN_V_SEP
+        originX = self._alienX0 + self._walkX
+        originY = self._alienY0 + self._walkY
+        col = np.rint((x-originX)/pitchX).astype(int)
+        inside = (col >= 0) & (col < ALIENS_IN_ROW)
+        col = np.clip(col,0,ALIENS_IN_ROW-1)
+        rows = np.arange(ALIEN_ROWS)
+        distance = _sweep(x[:,None],lastY[:,None],y[:,None],
+            (originX+col*pitchX)[:,None],originY[:,None]-rows*pitchY,
+            ALIEN_WIDTH,ALIEN_HEIGHT)
+        alive = self._alive[np.arange(self._n),:,col] & inside[:,None]
+        distance[~alive] = np.inf
+        row = distance.argmin(axis=1)
+        return (row,col,distance[np.arange(self._n),row])
+
+    def _damage(self,hit,barrier):
+        """
+        Takes BARRIER_HEALTH_DECREMENT from the given barrier of each wave
+        that was hit (as in Wave.collisionWithBarrier).
+
+        Parameter hit: Whether a barrier of each wave was hit
+        Precondition: hit is an (N,) array of bool
+
+        Parameter barrier: The barrier hit in each wave
+        Precondition: barrier is an (N,) array of int in 0..1
+        """
+        envs = np.flatnonzero(hit)
+        self._health[envs,barrier[envs]] -= BARRIER_HEALTH_DECREMENT
+
+    def _updateStatus(self,playing):
+        """
+        Marks the waves that were won or lost this frame (as at the end of
+        Wave.update and Invaders._helperActive).
+
+        Parameter playing: Whether each wave is in play
+        Precondition: playing is an (N,) array of bool
+        """
+        rows = self._alive.any(axis=2)
+        empty = ~rows.any(axis=1)
+        lowRow = rows.shape[1]-1-rows[:,::-1].argmax(axis=1)
+        bottom = self._alienY0 - lowRow*(ALIEN_HEIGHT+ALIEN_V_SEP) + \
+            self._walkY - ALIEN_HEIGHT/2
+        lose = playing & ((~empty & (bottom < DEFENSE_LINE)) |
+            (self._lives == 0))
+        self._status[playing & empty] = BATCH_WIN
+        self._status[lose] = BATCH_LOSE
+
+
+def _sweep(x,lastY,y,cx,cy,width,height):
+    """
+    Returns how far each bolt moved in its last step before it touched a
+    rectangle, with inf where it did not touch it.
+
+    This is sweepDistance (see models.py) for arrays. A bolt moved straight
+    up or down from lastY to y, and the whole path is tested. The arguments
+    are arrays (or numbers) that broadcast against each other.
+
+    Parameter x: The x coordinate of each bolt
+    Precondition: x is an array of float
+
+    Parameter lastY: The y coordinate of each bolt before its last step
+    Precondition: lastY is an array of float
+
+    Parameter y: The y coordinate of each bolt after its last step
+    Precondition: y is an array of float
+
+    Parameter cx: The x coordinate of the center of each rectangle
+    Precondition: cx is an array of float
+
+    Parameter cy: The y coordinate of the center of each rectangle
+    Precondition: cy is an array of float
+
+    Parameter width: The width of the rectangles
+    Precondition: width is an int or float >= 0
+
+    Parameter height: The height of the rectangles
+    Precondition: height is an int or float >= 0
+    """
+    reach = (height+BOLT_HEIGHT)/2
+    touch = ((np.abs(x-cx) < (width+BOLT_WIDTH)/2) &
+        (np.minimum(lastY,y) < cy+reach) & (np.maximum(lastY,y) > cy-reach))
+    distance = np.where(y >= lastY,(cy-reach)-lastY,lastY-(cy+reach))
+    return np.where(touch,np.maximum(distance,0),np.inf)
@@ -18,6 +18,8 @@ import sys
 GAME_WIDTH  = 800
 #: the height of the game display
 GAME_HEIGHT = 700
+#: the number of seconds in one (fixed) simulation step, at any frame rate
+GAME_TICK   = 1/60
 
 
 ### SHIP CONSTANTS ###
@@ -74,6 +76,32 @@ BOLT_HEIGHT = 16
 BOLT_SPEED  = 10
 # the number of ALIEN STEPS (not frames) between bolts
 BOLT_RATE   = 5
+# the color of a laser bolt
+BOLT_COLOR  = 'red'
+# the number of bolts built in advance for each wave (more are made if needed)
+BOLT_POOL   = 8
+
+
+### HUD CONSTANTS ###
+
+# the font of the score, lives and wave display at the top of the screen
+HUD_FONT      = 'RetroGame.ttf'
+# the point size of the score, lives and wave display
+HUD_FONT_SIZE = 20
+# the color of the score, lives and wave display
+HUD_COLOR     = 'black'
+# the distance of the display from the top left corner of the window
+HUD_MARGIN    = 16
+
+
+### LAYER CONSTANTS ###
+
+# the view layer for what only changes when a barrier is destroyed (the
+# defense line and the barriers), cached off screen
+LAYER_STATIC    = 'static'
+# the view layer for the alien formation, cached off screen; it is only
+# rendered again when the formation walks or loses an alien
+LAYER_FORMATION = 'formation'
 
 
 ### GAME CONSTANTS ###
@@ -100,6 +128,8 @@ BARRIER_Y = DEFENSE_LINE+80
 BARRIER_WIDTH = 90
 #The height of the barrier
 BARRIER_HEIGHT = 40
+#The color of the barrier
+BARRIER_COLOR = 'blue'
 #The amount by which to reduce the barrier health.
 BARRIER_HEALTH_DECREMENT = BARRIER_HEALTH/6
 
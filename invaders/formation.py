@@ -0,0 +1,429 @@
+"""
+Formation module for Alien Invaders
+
+This module contains the class Formation, which stores the state of the alien
+formation for a wave. Instead of keeping one object per alien, the formation
+keeps a few NumPy arrays (alive flags, positions and sprite kinds) indexed by
+row and column. The positions are fixed offsets from the formation origin, and
+marching the formation only moves that origin (two numbers), and
+questions about the formation (is anyone alive, where are its edges, which
+alien is at the bottom of a column) are answered from a few counters that are
+kept up to date as aliens are killed, without scanning the grid.
+
+Row 0 is the top row of the formation and column 0 is the leftmost column,
+just like the 2d list of aliens it replaces.
+"""
+from consts import *
+from models import *
+import math
+import numpy as np
+
+
+class Formation(object):
+    """
+    A class to represent the grid of aliens in a single wave.
+
+    The formation is a regular grid that walks as one block. Each cell of the
+    grid holds at most one alien. When an alien is killed its cell is marked
+    dead, but the cell keeps its position so that the grid stays regular.
+
+    This class does not draw anything (and does not import Kivy). WaveView
+    mirrors the live aliens into game2d images for rendering.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _alive: whether the alien in each cell is alive
+    # Invariant: _alive is a rows x cols NumPy array of bool
+    #
+    # Attribute _x: the x coordinate of the center of each cell before the
+    # formation walked (add _walkX for the current coordinate)
+    # Invariant: _x is a rows x cols NumPy array of float. It never changes
+    #
+    # Attribute _y: the y coordinate of the center of each cell before the
+    # formation walked (add _walkY for the current coordinate)
+    # Invariant: _y is a rows x cols NumPy array of float. It never changes
+    #
+    # Attribute _kind: the index in ALIEN_IMAGES of the sprite for each cell
+    # Invariant: _kind is a rows x cols NumPy array of int
+    #
+    # Attribute _walkX: The horizontal distance the formation has walked
+    # Invariant: _walkX is an int or float
+    #
+    # Attribute _walkY: The vertical distance the formation has walked
+    # Invariant: _walkY is an int or float
+    #
+    # Attribute _shooters: the row of the lowest live alien in each column
+    # Invariant: _shooters is a list of getCols() ints. An entry is the
+    # largest row whose alien is alive in that column, or -1 if the column
+    # is empty
+    #
+    # Attribute _liveCols: the columns with at least one live alien
+    # Invariant: _liveCols is a list of ints in increasing order, exactly the
+    # columns whose entry in _shooters is not -1
+    #
+    # Attribute _count: the number of live aliens
+    # Invariant: _count is an int, the number of True entries in _alive
+    #
+    # Attribute _rowCounts: the number of live aliens in each row
+    # Invariant: _rowCounts is a list of getRows() ints >= 0
+    #
+    # Attribute _lowestRow: the lowest row with a live alien
+    # Invariant: _lowestRow is the largest row whose entry in _rowCounts is
+    # not 0, or -1 if the formation is empty
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getRows(self):
+        """
+        Returns the number of rows in the formation
+        """
+        return self._alive.shape[0]
+
+    def getCols(self):
+        """
+        Returns the number of columns in the formation
+        """
+        return self._alive.shape[1]
+
+    def getAlive(self):
+        """
+        Returns a read-only view of the alive flags of the formation
+        """
+        return self._readOnly(self._alive)
+
+    def getXs(self):
+        """
+        Returns a new array of the x coordinates of the formation
+        """
+        return self._x + self._walkX
+
+    def getYs(self):
+        """
+        Returns a new array of the y coordinates of the formation
+        """
+        return self._y + self._walkY
+
+    def getLocalXs(self):
+        """
+        Returns a read-only view of the x coordinates of the formation
+        before it walked
+
+        These never change. The current x coordinates are these plus the
+        first value of getOffset.
+        """
+        return self._readOnly(self._x)
+
+    def getLocalYs(self):
+        """
+        Returns a read-only view of the y coordinates of the formation
+        before it walked
+
+        These never change. The current y coordinates are these plus the
+        second value of getOffset.
+        """
+        return self._readOnly(self._y)
+
+    def getKinds(self):
+        """
+        Returns a read-only view of the sprite kinds of the formation
+        """
+        return self._readOnly(self._kind)
+
+    def getOffset(self):
+        """
+        Returns the distance (dx, dy) the formation has walked as a tuple
+        """
+        return (self._walkX,self._walkY)
+
+    def isAlive(self,row,col):
+        """
+        Returns True if the alien at (row, col) is alive
+
+        Parameter row: The row of the alien
+        Precondition: row is an int, 0 <= row < getRows()
+
+        Parameter col: The column of the alien
+        Precondition: col is an int, 0 <= col < getCols()
+        """
+        return bool(self._alive[row,col])
+
+    def getX(self,row,col):
+        """
+        Returns the x coordinate of the alien at (row, col) as a float
+
+        Parameter row: The row of the alien
+        Precondition: row is an int, 0 <= row < getRows()
+
+        Parameter col: The column of the alien
+        Precondition: col is an int, 0 <= col < getCols()
+        """
+        return float(self._x[row,col]) + self._walkX
+
+    def getY(self,row,col):
+        """
+        Returns the y coordinate of the alien at (row, col) as a float
+
+        Parameter row: The row of the alien
+        Precondition: row is an int, 0 <= row < getRows()
+
+        Parameter col: The column of the alien
+        Precondition: col is an int, 0 <= col < getCols()
+        """
+        return float(self._y[row,col]) + self._walkY
+
+    # INITIALIZER TO CREATE THE FORMATION
+    def __init__(self,rows=ALIEN_ROWS,cols=ALIENS_IN_ROW):
+        """
+        Initializes a formation with every alien alive.
+
+        The aliens are laid out exactly as in the original Wave: the top
+        row is ALIEN_CEILING below the top of the window, and the columns
+        start ALIEN_H_SEP from the left edge. Every two rows (counting from
+        the bottom) share the same sprite kind.
+
+        Parameter rows: The number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: The number of aliens in each row
+        Precondition: cols is an int > 0
+        """
+        assert type(rows) == int and rows > 0
+        assert type(cols) == int and cols > 0
+        row_i = np.arange(rows).reshape(rows,1)
+        col_i = np.arange(cols).reshape(1,cols)
+
+        self._alive = np.ones((rows,cols),dtype=bool)
+        self._x = np.zeros((rows,cols)) + (ALIEN_H_SEP + 0.5*ALIEN_WIDTH +
+            col_i*(ALIEN_WIDTH+ALIEN_H_SEP))
+        self._y = np.zeros((rows,cols)) + ((GAME_HEIGHT-ALIEN_CEILING) -
+            0.5*ALIEN_HEIGHT - row_i*(ALIEN_V_SEP+ALIEN_HEIGHT))
+        self._kind = np.zeros((rows,cols),dtype=int) + \
+            ((rows-row_i-1)//2)%len(ALIEN_IMAGES)
+        self._walkX = 0
+        self._walkY = 0
+        self._shooters = [rows-1]*cols
+        self._liveCols = list(range(cols))
+        self._count = rows*cols
+        self._rowCounts = [cols]*rows
+        self._lowestRow = rows-1
+
+    # METHODS TO MOVE AND QUERY THE FORMATION
+    def march(self,dx,dy):
+        """
+        Moves every alien in the formation by (dx, dy).
+
+        Only the walk offset changes, as the cell positions are relative to
+        it, so a march takes the same time however large the formation is.
+
+        Parameter dx: The horizontal distance to move
+        Precondition: dx is an int or float
+
+        Parameter dy: The vertical distance to move
+        Precondition: dy is an int or float
+        """
+        assert type(dx) in [int,float]
+        assert type(dy) in [int,float]
+        self._walkX += dx
+        self._walkY += dy
+
+    def kill(self,row,col):
+        """
+        Marks the alien at (row, col) as dead.
+
+        If this was the lowest alien of its column, the alien above it (if
+        any) becomes the shooter of the column. The column is dropped from
+        the live columns when its last alien dies. The live count and the
+        lowest row are updated as well. Killing an alien that is already
+        dead does nothing.
+
+        Parameter row: The row of the alien
+        Precondition: row is an int, 0 <= row < getRows()
+
+        Parameter col: The column of the alien
+        Precondition: col is an int, 0 <= col < getCols()
+        """
+        if not self._alive[row,col]:
+            return
+        self._alive[row,col] = False
+        self._count -= 1
+        self._rowCounts[row] -= 1
+        while self._lowestRow >= 0 and self._rowCounts[self._lowestRow] == 0:
+            self._lowestRow -= 1
+        if self._shooters[col] == row:
+            above = np.flatnonzero(self._alive[:row,col])
+            if len(above) > 0:
+                self._shooters[col] = int(above[-1])
+            else:
+                self._shooters[col] = -1
+                self._liveCols.remove(col)
+
+    def count(self):
+        """
+        Returns the number of aliens still alive
+        """
+        return self._count
+
+    def isEmpty(self):
+        """
+        Returns True if every alien in the formation is dead
+        """
+        return self._count == 0
+
+    def left(self):
+        """
+        Returns the left edge of the leftmost live alien
+
+        All the aliens of a column share the same x coordinate, so this is
+        read from the first live column.
+
+        Precondition: the formation is not empty
+        """
+        return float(self._x[0,self._liveCols[0]]) + self._walkX - ALIEN_WIDTH/2
+
+    def right(self):
+        """
+        Returns the right edge of the rightmost live alien
+
+        All the aliens of a column share the same x coordinate, so this is
+        read from the last live column.
+
+        Precondition: the formation is not empty
+        """
+        return float(self._x[0,self._liveCols[-1]]) + self._walkX + ALIEN_WIDTH/2
+
+    def bottom(self):
+        """
+        Returns the bottom edge of the lowest live alien
+
+        All the aliens of a row share the same y coordinate, so this is read
+        from the lowest row with a live alien.
+
+        Precondition: the formation is not empty
+        """
+        return float(self._y[self._lowestRow,0]) + self._walkY - ALIEN_HEIGHT/2
+
+    def liveColumns(self):
+        """
+        Returns the indices of the columns with at least one live alien
+
+        The value returned is a tuple of ints, in increasing order.
+        """
+        return tuple(self._liveCols)
+
+    def bottomOfColumn(self,col):
+        """
+        Returns the row of the lowest live alien in column col
+
+        Returns None if the column is empty.
+
+        Parameter col: The column to check
+        Precondition: col is an int, 0 <= col < getCols()
+        """
+        row = self._shooters[col]
+        return row if row >= 0 else None
+
+    def chooseShooter(self,rng):
+        """
+        Returns the (row, col) of a random alien that can fire.
+
+        Only the lowest alien of a column can fire. The column is chosen
+        uniformly among the columns with a live alien. The choice takes the
+        same time however large the formation is, as the shooters are kept
+        up to date by kill.
+
+        Parameter rng: The source of random numbers
+        Precondition: rng is a random.Random object; the formation is not
+        empty
+        """
+        col = rng.choice(self._liveCols)
+        return (self._shooters[col],col)
+
+    def cellAt(self,x,y):
+        """
+        Returns the (row, col) of the formation cell nearest to (x,y).
+
+        The cell is computed from the formation origin, the alien spacing
+        and the walk offset instead of searching the grid. As a bolt is
+        smaller than the separation between aliens, the alien in this cell
+        is the only one a bolt centered at (x,y) can touch. Returns None if
+        (x,y) is outside of the formation.
+
+        Parameter x: The x coordinate of the point
+        Precondition: x is an int or float
+
+        Parameter y: The y coordinate of the point
+        Precondition: y is an int or float
+        """
+        assert type(x) in [int,float]
+        assert type(y) in [int,float]
+        originX = ALIEN_H_SEP + 0.5*ALIEN_WIDTH + self._walkX
+        originY = (GAME_HEIGHT-ALIEN_CEILING) - 0.5*ALIEN_HEIGHT + self._walkY
+        col_i = round((x-originX)/(ALIEN_WIDTH+ALIEN_H_SEP))
+        row_i = round((originY-y)/(ALIEN_HEIGHT+ALIEN_V_SEP))
+        if 0 <= row_i < self.getRows() and 0 <= col_i < self.getCols():
+            return (row_i,col_i)
+        return None
+
+    def collides(self,bolt):
+        """
+        Returns the (row, col) of the live alien hit by bolt, or None
+
+        See sweep for how the alien is found. Alien bolts never hit aliens.
+
+        Parameter bolt: The laser bolt to check
+        Precondition: bolt is of class Bolt
+        """
+        hit = self.sweep(bolt)
+        return None if hit is None else hit[1]
+
+    def sweep(self,bolt):
+        """
+        Returns the first live alien hit by bolt in its last step, or None
+
+        The value returned is a tuple (distance, (row, col)), where distance
+        is how far the bolt moved before it hit the alien (see sweepDistance).
+        The whole path of the bolt is tested, so a bolt cannot jump over an
+        alien. If the path crosses several aliens of the column, the one the
+        bolt reaches first is returned.
+
+        Only the column under the bolt is tested, and only the rows the path
+        can reach, so the cost does not grow with the size of the formation.
+        The cells are found from the bolt position relative to the formation
+        origin, and only the cells tested are moved by the walk offset.
+        Alien bolts never hit aliens.
+
+        Parameter bolt: The laser bolt to check
+        Precondition: bolt is of class Bolt
+        """
+        if not bolt.isPlayerBolt():
+            return None
+        pitch = ALIEN_HEIGHT+ALIEN_V_SEP
+        originY = (GAME_HEIGHT-ALIEN_CEILING) - 0.5*ALIEN_HEIGHT + self._walkY
+        reach = (ALIEN_HEIGHT+bolt.getHeight())/2
+        low = min(bolt.getLastY(),bolt.getY()) - reach
+        high = max(bolt.getLastY(),bolt.getY()) + reach
+        cell = self.cellAt(bolt.getX(),originY)
+        if cell is None:
+            return None
+        col = cell[1]
+        first = max(0,math.floor((originY-high)/pitch))
+        last = min(self.getRows()-1,math.ceil((originY-low)/pitch))
+        # A player bolt moves up, so it reaches the lower rows first
+        for row in range(last,first-1,-1):
+            if self._alive[row,col]:
+                distance = sweepDistance(bolt,float(self._x[row,col])+\
+                self._walkX,float(self._y[row,col])+self._walkY,\
+                ALIEN_WIDTH,ALIEN_HEIGHT)
+                if distance is not None:
+                    return (distance,(row,col))
+        return None
+
+    # HELPER METHODS
+    def _readOnly(self,array):
+        """
+        Returns a view of array that cannot be written to
+
+        Parameter array: The array to protect
+        Precondition: array is a NumPy array
+        """
+        view = array.view()
+        view.flags.writeable = False
+        return view
@@ -10,6 +10,8 @@ Date:   August 1, 2017 (Python 3 version)
 from .gobject import GObject, GScene
 from .grectangle import GRectangle, GEllipse, GImage, GLabel
 from .gsprite import GSprite
+from .gbatch import GBatch
+from .gtext import GText
 from .gpath import GPath, GTriangle, GPolygon
 from .gview import GInput, GView
 from .sound import Sound, SoundLibrary
@@ -14,7 +14,9 @@ import kivy.app
 # Lower-level kivy modules to support animation
 from kivy.config import Config
 from kivy.clock  import Clock
+from kivy.logger import Logger
 
+from collections import deque
 import os.path
 
 class GameApp(kivy.app.App):
@@ -38,6 +40,18 @@ class GameApp(kivy.app.App):
     """
     # Class attribute for tracking textures (to reduce memory footprint)
     TEXTURE_CACHE = {}
+    # Class attribute for the texture holding every image (see build_atlas)
+    TEXTURE_ATLAS = None
+    # Class attribute mapping each image in the atlas to its (x,y,width,height)
+    ATLAS_REGIONS = {}
+    # The file extensions of the images packed into the atlas
+    ATLAS_EXTENSIONS = ('.png','.jpg','.jpeg','.gif')
+    # The number of recent frames kept in frame_times
+    FRAME_HISTORY = 120
+    # The number of frames between two decisions to change the frame rate
+    PACE_WINDOW = 30
+    # The largest divisor of fps the frame rate can drop to
+    PACE_DIVISORS = 4
     
     
     # MUTABLE ATTRIBUTES
@@ -48,7 +62,13 @@ class GameApp(kivy.app.App):
         
         By default this value is 60 FPS. However, we cannot guarantee that the FPS is 
         achievable.  If you are having performance stuttering, you might want to drop
-        this value to 30 FPS instead.
+        this value to 30 FPS instead, or let the game do that (see :attr:`adaptive`).
+        
+        Every frame schedules the next one for its deadline, one frame after its own.
+        The Kivy clock runs it on the first of its own frames (see the ``maxfps`` Kivy
+        setting) at or after that deadline, and sleeps in between.  The deadlines do not
+        drift, so the frames keep this cadence on average, however long each one takes.  To simulate faster than this, set 
+        :attr:`tick` to a smaller step (for example, ``tick=1/120`` with ``fps=60``).
         
         **Invariant**: Must be an int or float > 0.
         """
@@ -58,9 +78,134 @@ class GameApp(kivy.app.App):
     def fps(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         assert value > 0, 'value %s is not positive' % repr(value)
-        Clock.unschedule(self._refresh)
         self._fps = value
-        Clock.schedule_interval(self._refresh,1.0/self._fps)
+        self._divisor = 1
+        self._schedule()
+    
+    @property
+    def tick(self):
+        """
+        The length in seconds of a fixed simulation step, or None
+        
+        If this value is None (the default), :meth:`update` is called once per animation 
+        frame with the actual time since the last frame.  Anything that moves a fixed 
+        amount per update then moves faster or slower with the frame rate.
+        
+        If this value is a number, the game runs in fixed-step mode.  The time of each 
+        animation frame is added to an accumulator, and :meth:`update` is called with 
+        ``dt`` equal to ``tick`` once for every full tick in the accumulator (so zero, 
+        one or several times per frame).  The game then plays out the same no matter 
+        the frame rate.  Use :attr:`alpha` to draw moving objects between ticks.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._tick
+    
+    @tick.setter
+    def tick(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._tick = value
+        self._accum = 0.0
+        self._alpha = 1.0
+    
+    @property
+    def retained(self):
+        """
+        Whether the view keeps its contents from one animation frame to the next.
+        
+        If this value is False (the default), the view is cleared at the start of every
+        animation frame, and :meth:`draw` must draw every object again.  
+        
+        If this value is True, the view is never cleared for you.  An object drawn once 
+        stays on screen, and changes to its attributes show up on their own, until it 
+        is erased with its ``erase`` method (or the view is cleared with ``view.clear()``).
+        This saves rebuilding the whole canvas every frame when little changes.  The 
+        method :meth:`draw` only needs to draw objects that are new.
+        
+        **Invariant**: Must be a bool.
+        """
+        return self._retained
+    
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._retained = value
+    
+    @property
+    def max_ticks(self):
+        """
+        The most fixed simulation steps to run in a single animation frame
+        
+        If a frame takes so long that the accumulator holds more than this many ticks, 
+        the extra time is dropped.  The game slows down instead of spending ever longer 
+        frames catching up.  This value is ignored if :attr:`tick` is None.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._maxticks
+    
+    @max_ticks.setter
+    def max_ticks(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._maxticks = value
+    
+    @property
+    def adaptive(self):
+        """
+        Whether the frame rate drops when the frames cannot keep up with :attr:`fps`.
+        
+        The time spent in :meth:`update` and :meth:`draw` is measured every frame.  If
+        this value is True (the default), and that time is close to the length of a frame
+        on average, the frame rate drops to ``fps/2`` (then ``fps/3`` and so on, down to
+        ``fps/PACE_DIVISORS``).  Frames that come at an even slower cadence look smoother
+        than frames that are sometimes late.  The rate goes back up once the frames are 
+        cheap enough.  If this value is False, the frame rate is always :attr:`fps`.
+        
+        **Invariant**: Must be a bool.
+        """
+        return self._adaptive
+    
+    @adaptive.setter
+    def adaptive(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._adaptive = value
+        if not value and self._divisor > 1:
+            self._divisor = 1
+            self._framecosts.clear()
+    
+    @property
+    def idle(self):
+        """
+        Whether the game only animates a frame when something asks for one.
+        
+        If this value is False (the default), the game animates ``fps`` frames every 
+        second.  This is what a game in play needs, but it keeps the processor busy 
+        even while the game is waiting on a title screen or a pause message.
+        
+        If this value is True, the game loop sleeps.  A single frame is animated when 
+        a key is pressed or released, when the mouse is clicked, dragged or released, 
+        or when :meth:`request_frame` is called.  Such a frame calls :meth:`update` 
+        exactly once, with the time since the frame was asked for (or ``tick`` in 
+        fixed-step mode), and then :meth:`draw`.  Making the game idle asks for one last
+        frame, so whatever changed on the way to idle is shown.  Setting this value back
+        to False resumes animating at the full frame rate.
+        
+        **Invariant**: Must be a bool.
+        """
+        return self._idle
+    
+    @idle.setter
+    def idle(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        if value == self._idle:
+            return
+        self._idle = value
+        self._accum = 0.0
+        self._deadline = None
+        self._schedule()
+        self.request_frame()
     
     
     # IMMUTABLE PROPERTIES
@@ -106,6 +251,82 @@ class GameApp(kivy.app.App):
         """
         return self._input
     
+    @property
+    def alpha(self):
+        """
+        How far the game is between the last simulation step and the next one.
+        
+        In fixed-step mode (see :attr:`tick`) the time left in the accumulator after 
+        the last tick is not simulated yet.  This value is that time as a fraction of a 
+        tick.  To draw smooth motion, draw a moving object at ``prev+alpha*(cur-prev)``,
+        where ``prev`` and ``cur`` are its positions before and after the last tick.
+        
+        This value is always 1 when :attr:`tick` is None.
+        
+        **Immutable**: This value cannot be altered.
+        
+        **Invariant**: Must be a float in the range 0..1.
+        """
+        return self._alpha
+    
+    @property
+    def atlas(self):
+        """
+        Whether the images are packed into a single texture when the game starts.
+        
+        If this value is True, :meth:`build_atlas` is called just before :meth:`start`.
+        Every image is then decoded and on the graphics card before the first frame,
+        and all images share one texture (see :meth:`build_atlas`).
+        
+        **Immutable**: This value cannot be altered.
+        
+        **Invariant**: Must be a bool.
+        """
+        return self._atlas
+    
+    @property
+    def frame_rate(self):
+        """
+        The number of frames-per-second the game is animating at.
+        
+        This is :attr:`fps`, unless the game is :attr:`adaptive` and dropped the rate
+        to a fraction of it.
+        
+        **Immutable**: This value cannot be altered.
+        
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._fps/self._divisor
+    
+    @property
+    def frame_times(self):
+        """
+        The time in seconds between the starts of the most recent animation frames.
+        
+        The value holds up to ``FRAME_HISTORY`` times, oldest first.  Frames animated 
+        while the game is :attr:`idle` are not counted.
+        
+        **Immutable**: This value cannot be altered.
+        
+        **Invariant**: Must be a tuple of floats > 0.
+        """
+        return tuple(self._frametimes)
+    
+    @property
+    def dropped_frames(self):
+        """
+        The number of frames missed since the game started.
+        
+        Every frame has a deadline, one frame (at :attr:`frame_rate`) after the last. 
+        A frame is missed when the deadline of the next frame passes before it starts.
+        Every miss is also reported in the Kivy log, at the debug level.
+        
+        **Immutable**: This value cannot be altered.
+        
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._dropped
+    
     # CLASS METHODS
     @classmethod
     def is_image(cls,name):
@@ -188,6 +409,112 @@ class GameApp(kivy.app.App):
         
         return texture
     
+    @classmethod
+    def build_atlas(cls,names=None,width=1024,padding=1):
+        """
+        Returns: The texture holding all of the given images, packed together
+        
+        The images are packed into a single texture by :meth:`pack_textures`, with 
+        ``padding`` empty pixels around each image so that they do not bleed into each 
+        other when scaled.  Each image is then put in the texture cache as a region of 
+        this texture.  From then on :meth:`load_texture` returns that region, so 
+        :class:`GImage`, :class:`GSprite` and :class:`GBatch` pick their image out of 
+        the shared texture without any change.  Shapes that use the same texture can be 
+        drawn together (see :meth:`GBatch.shares`).
+        
+        The atlas is kept in the class attribute ``TEXTURE_ATLAS``.  The position of
+        each image, as a tuple (x,y,width,height) in pixels, is kept in the class 
+        attribute ``ATLAS_REGIONS``.  The texture coordinates of an image are those of 
+        its region, given by its ``tex_coords`` attribute.
+        
+        If ``names`` is None, it packs every image in the **Images** folder.  An image 
+        wider than the atlas is left out, and loaded on its own as before.  This method
+        must be called once the game window exists (e.g. in :meth:`start`).
+        
+        :param names: The file names to pack
+        :type names:  list of ``str`` or None
+        
+        :param width: The width of the atlas in pixels
+        :type width:  ``int`` > 0
+        
+        :param padding: The empty pixels around each image
+        :type padding:  ``int`` >= 0
+        """
+        from kivy.core.image import Image
+        if names is None:
+            names = sorted(name for name in os.listdir(cls.images) 
+                           if os.path.splitext(name)[1].lower() in cls.ATLAS_EXTENSIONS)
+        
+        textures = {}
+        for name in names:
+            assert cls.is_image(name), '%s is not an image file' % repr(name)
+            try:
+                textures[name] = Image(name).texture
+            except:
+                pass
+        
+        (atlas, regions) = cls.pack_textures(textures,width,padding)
+        cls.TEXTURE_ATLAS = atlas
+        cls.ATLAS_REGIONS = regions
+        for name in regions:
+            cls.TEXTURE_CACHE[name] = atlas.get_region(*regions[name])
+        return atlas
+    
+    @classmethod
+    def pack_textures(cls,textures,width=1024,padding=1):
+        """
+        Returns: The pair (texture, regions) of the given textures packed into one
+        
+        The textures are packed in rows (tallest first), with ``padding`` empty pixels
+        around each one.  They are drawn into the new texture once, on the graphics 
+        card.  The value ``regions`` is a dictionary that maps the key of each texture 
+        to its position (x,y,width,height) in the new texture.  A texture wider than 
+        the new texture is left out.
+        
+        This is the packing used by :meth:`build_atlas`, and by :class:`GText` for the 
+        glyphs of a font.  It must be called once the game window exists.
+        
+        :param textures: The textures to pack
+        :type textures:  ``dict`` of Kivy textures
+        
+        :param width: The width of the new texture in pixels
+        :type width:  ``int`` > 0
+        
+        :param padding: The empty pixels around each texture
+        :type padding:  ``int`` >= 0
+        """
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Color, Rectangle
+        assert type(width) == int and width > 0, '%s is not a valid width' % repr(width)
+        assert type(padding) == int and padding >= 0, '%s is not a valid padding' % repr(padding)
+        
+        items = [(key,textures[key]) for key in textures 
+                 if textures[key].width+2*padding <= width]
+        items.sort(key=lambda item: -item[1].height)
+        regions = {}
+        x = 0
+        y = 0
+        row = 0
+        for (key,texture) in items:
+            if x+texture.width+2*padding > width:
+                x = 0
+                y += row
+                row = 0
+            regions[key] = (x+padding,y+padding,texture.width,texture.height)
+            x += texture.width+2*padding
+            row = max(row,texture.height+2*padding)
+        height = max(1,y+row)
+        
+        fbo = Fbo(size=(width,height))
+        with fbo:
+            ClearColor(0,0,0,0)
+            ClearBuffers()
+            Color(1,1,1,1)
+            for (key,texture) in items:
+                region = regions[key]
+                Rectangle(pos=region[:2],size=region[2:],texture=texture)
+        fbo.draw()
+        return (fbo.texture, regions)
+    
     @classmethod
     def unload_texture(cls,name):
         """
@@ -220,6 +547,17 @@ class GameApp(kivy.app.App):
             
             GameApp(width=400,height=400)
         
+        To simulate in fixed steps of 1/60 of a second, no matter the frame rate, add 
+        the keyword ``tick`` (see the attribute of the same name)::
+            
+            GameApp(width=400,height=400,tick=1/60)
+        
+        To keep the contents of the view from one frame to the next, add the keyword 
+        ``retained=True`` (see the attribute of the same name).  To pack every image 
+        into one texture before the game starts, add the keyword ``atlas=True``.  To 
+        always animate at ``fps``, even when the frames cannot keep up, add the keyword
+        ``adaptive=False`` (see the attribute of the same name).
+        
         The game window will not show until you start the game. To start the game, use 
         the method ``run()``.
         
@@ -232,6 +570,22 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        t = keywords.pop('tick', None)
+        m = keywords.pop('max_ticks', 5)
+        r = keywords.pop('retained', False)
+        a = keywords.pop('atlas', False)
+        d = keywords.pop('adaptive', True)
+        self._idle = False
+        self._scheduled = False
+        assert type(d) == bool, 'adaptive %s is not a bool' % repr(d)
+        self._adaptive = d
+        self._divisor = 1
+        self._deadline = None
+        self._start = 0.0
+        self._frametimes = deque(maxlen=GameApp.FRAME_HISTORY)
+        self._framecosts = deque(maxlen=GameApp.PACE_WINDOW)
+        self._dropped = 0
+        self._trigger = Clock.create_trigger(self._refresh)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
@@ -241,6 +595,11 @@ class GameApp(kivy.app.App):
         self._gwidth = w
         self._gheight = h
         self._fps = f
+        self.tick = t
+        self.max_ticks = m
+        self.retained = r
+        assert type(a) == bool, 'atlas %s is not a bool' % repr(a)
+        self._atlas = a
         
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
@@ -263,6 +622,10 @@ class GameApp(kivy.app.App):
         self._view.size_hint = (1,1)
         self._input = GInput()
         self._input._register(self._view)
+        
+        from kivy.core.window import Window
+        Window.bind(on_key_down=self._wake,on_key_up=self._wake)
+        Window.bind(on_touch_down=self._wake,on_touch_move=self._wake,on_touch_up=self._wake)
         return self.view
     
     def run(self):
@@ -286,6 +649,18 @@ class GameApp(kivy.app.App):
         kivy.app.App.stop(self)
         sys.exit(0)
     
+    def request_frame(self):
+        """
+        Asks for a single animation frame while the game is :attr:`idle`.
+        
+        Call this method when something outside of the input (such as a timer) changes 
+        what should be on screen.  Several requests before the frame is animated give a
+        single frame.  This method does nothing if the game is not idle, as the next 
+        frame is coming anyway.
+        """
+        if self._idle and self._scheduled:
+            self._trigger()
+    
     def start(self):
         """
         Initializes the game state, creating a new game.
@@ -333,10 +708,10 @@ class GameApp(kivy.app.App):
         This method is a callback-proxy for method `start`.  It handles important issues 
         behind the scenes, particularly with setting the FPS
         """
-        if (self.fps < 60):
-            Clock.schedule_interval(self._refresh,1.0/self.fps)
-        else:
-            Clock.schedule_interval(self._refresh,0)
+        self._scheduled = True
+        self._schedule()
+        if self._atlas:
+            GameApp.build_atlas()
         self.start()
     
     def _refresh(self,dt):
@@ -344,14 +719,132 @@ class GameApp(kivy.app.App):
         Processes a single animation frame.
         
         This method a callback-proxy for the methods `update` and `draw`.  It handles
-        important issues behind the scenes, particularly with clearing the window.
+        important issues behind the scenes, particularly with clearing the window
+        (unless the game is :attr:`retained`). In fixed-step mode it also runs the 
+        accumulator (see :attr:`tick`), except in a frame animated while :attr:`idle`.
         
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
-        self.view.clear()
-        self.update(dt)
+        start = self._measure()
+        
+        if not self._retained:
+            self.view.clear()
+        if self._idle:
+            self.update(dt if self._tick is None else self._tick)
+        elif self._tick is None:
+            self.update(dt)
+        else:
+            self._accum += dt
+            ticks = 0
+            while self._accum >= self._tick and ticks < self._maxticks:
+                self.update(self._tick)
+                self._accum -= self._tick
+                ticks += 1
+            if self._accum >= self._tick:
+                self._accum %= self._tick
+            self._alpha = self._accum/self._tick
         self.draw()
+        
+        if not self._idle:
+            self._framecosts.append(Clock.time()-start)
+            if self._adaptive and len(self._framecosts) == GameApp.PACE_WINDOW:
+                self._adapt()
+            self._next(start)
+    
+    def _schedule(self):
+        """
+        Schedules the game loop to match the attribute :attr:`idle`.
+        
+        Nothing is scheduled before the game starts (see :meth:`_bootstrap`), or while 
+        the game is idle, as frames are then triggered instead.  Otherwise, the next 
+        frame is scheduled right away, and the cadence starts over from that frame.
+        """
+        Clock.unschedule(self._refresh)
+        self._deadline = None
+        if not self._scheduled or self._idle:
+            return
+        Clock.schedule_once(self._refresh,0)
+    
+    def _next(self,start):
+        """
+        Schedules the next frame for its deadline.
+        
+        The deadline is one frame (at :attr:`frame_rate`) after the deadline of this 
+        frame.  The frame is scheduled with the Kivy clock, which sleeps until then.
+        The clock measures the delay from the time of its current tick (and not from
+        when the frame is scheduled), so the delay is computed from that time too.
+        
+        :param start: the time this frame started, from ``Clock.get_time``
+        :type start:  ``float``
+        """
+        if self._deadline is None:
+            self._deadline = start
+        self._deadline += 1.0/self.frame_rate
+        Clock.unschedule(self._refresh)
+        Clock.schedule_once(self._refresh,max(0,self._deadline-Clock.get_time()))
+    
+    def _measure(self):
+        """
+        Returns the time this frame starts, recording it in :attr:`frame_times`.
+        
+        If this frame started a whole frame (or more) after its deadline, the frames 
+        in between are counted as dropped, and the cadence starts over from this frame.
+        No frame is recorded while the game is :attr:`idle`.
+        
+        :return: the time the frame starts, from ``Clock.get_time``
+        :rtype:  ``float``
+        """
+        now = Clock.get_time()
+        if self._idle:
+            self._deadline = None
+            return now
+        if self._deadline is None:
+            self._start = now
+            return now
+        
+        period = 1.0/self.frame_rate
+        if now-self._deadline >= period:
+            missed = int((now-self._deadline)/period)
+            self._dropped += missed
+            Logger.debug('GameApp: dropped %d frame(s), last frame took %.1f ms' % 
+                         (missed,1000*(now-self._start)))
+            self._deadline = now
+        self._frametimes.append(now-self._start)
+        self._start = now
+        return now
+    
+    def _adapt(self):
+        """
+        Changes the frame rate if the recent frames were too slow or fast enough.
+        
+        The rate drops to the next fraction of :attr:`fps` if the frames used more than
+        90% of a frame on average.  It rises to the previous fraction if the frames would
+        have used less than half of a frame at that rate.
+        """
+        cost = sum(self._framecosts)/len(self._framecosts)
+        divisor = self._divisor
+        if cost > 0.9*divisor/self._fps and divisor < GameApp.PACE_DIVISORS:
+            divisor += 1
+        elif divisor > 1 and cost < 0.5*(divisor-1)/self._fps:
+            divisor -= 1
+        
+        if divisor != self._divisor:
+            Logger.debug('GameApp: frame rate changed to %.1f fps' % (self._fps/divisor))
+            self._divisor = divisor
+        self._framecosts.clear()
+    
+    def _wake(self,*args):
+        """
+        Asks for an animation frame in response to an input event.
+        
+        This method is bound to the keyboard and mouse events of the window.  It never 
+        handles the event, so the event still goes on to :class:`GInput`.
+        
+        :param args: the arguments of the event (ignored)
+        :type args:  ``tuple``
+        """
+        self.request_frame()
     
     def _setpaths(self):
         """
@@ -0,0 +1,415 @@
+"""
+A module to support batched drawing of many images.
+
+This module draws many copies of the same image with a single Kivy mesh.  Every image
+in a :class:`GImage` is its own group of graphics instructions (a transform, a color,
+and a rectangle), so hundreds of images mean hundreds of draw calls.  A batch puts the
+images in one vertex list instead, and draws them all at once.
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+from .gobject import GObject
+from .app import GameApp
+
+# #mark -
+class GBatch(GObject):
+    """
+    A class representing many copies of an image, drawn together.
+
+    The image is given by a JPEG, PNG, or GIF file whose name is stored in the attribute
+    `source`.  Each copy is a rectangle (a quad) added with :meth:`add`, which returns
+    the index of the quad.  A quad may show a different image than ``source``, as 
+    long as that image is in the same texture (see :meth:`shares`).  This is the case
+    for every image once they are packed with :meth:`GameApp.build_atlas`.  Quads can
+    then be moved, hidden, or shown again by index.  A quad is never removed; hiding it
+    makes it invisible.
+
+    Changing a quad only changes its entries in the vertex list.  The list is sent to
+    the graphics card once per frame, the next time the batch is drawn, no matter how
+    many quads changed.
+
+    The quads are positioned as if (x,y) is the origin, just like the children of a
+    :class:`GScene`.  Changing the attributes `x` and `y` therefore moves every quad.
+    The attributes ``width`` and ``height`` are immutable, and computed from the
+    visible quads.  The box around the visible quads need not be centered on the 
+    origin, and :meth:`contains` tests the points against that box.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for the image of every quad.
+
+        **invariant**. Value be a string refering to a valid file.
+        """
+        return self._source
+
+    @source.setter
+    def source(self,value):
+        assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        self._source = value
+        if self._defined:
+            self._reset()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def count(self):
+        """
+        The number of quads in this batch, visible or not.
+
+        **invariant**: Value must be an ``int`` >= 0
+        """
+        return len(self._quads)
+
+    @property
+    def width(self):
+        """
+        The horizontal width of this batch.
+
+        The value is the width of the smallest bounding box that contains all of the
+        visible quads.  It is 0 if no quad is visible.
+
+        **invariant**: Value must be an ``int`` or ``float`` >= 0
+        """
+        (left,bottom,right,top) = self._extent()
+        return right-left
+
+    @property
+    def height(self):
+        """
+        The vertical height of this batch.
+
+        The value is the height of the smallest bounding box that contains all of the
+        visible quads.  It is 0 if no quad is visible.
+
+        **invariant**: Value must be an ``int`` or ``float`` >= 0
+        """
+        (left,bottom,right,top) = self._extent()
+        return top-bottom
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new, empty batch of images.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes. For example, to make a
+        batch of the image ``alien1.png``, use the constructor::
+
+            GBatch(source='alien1.png')
+
+        This class supports the same keywords as :class:`GObject`, though some of them
+        are unused, as the `width` and `height` attributes are now immutable.  The only
+        new keyword is ``source``.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._quads = []
+        self._sources = []
+        self._verts = []
+        self._indices = []
+        self._dirty = False
+        self._grown = False
+        self._etrue = False
+        self._mesh = None
+        self.source = keywords['source'] if 'source' in keywords else None
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+
+
+    # PUBLIC METHODS
+    def shares(self,source):
+        """
+        Checks whether an image can be drawn by a quad of this batch.
+
+        This is True if the image is in the same texture as ``source`` (for example,
+        if both are in the atlas built by :meth:`GameApp.build_atlas`).
+
+        :param source: the image file name
+        :type source:  ``str``
+
+        :return: True if a quad of this batch can show ``source``
+        :rtype:  ``bool``
+        """
+        if source is None or source == self.source:
+            return True
+        mine  = self._region(None)
+        other = self._region(source)
+        return mine is not None and other is not None and \
+               mine.id == other.id
+
+    def add(self,x,y,width,height,source=None):
+        """
+        Adds a visible quad centered at (x,y) and returns its index.
+
+        The quad shows the image ``source``, or the batch ``source`` if it is None.
+
+        :param x: the horizontal coordinate of the quad center
+        :type x:  ``int`` or ``float``
+
+        :param y: the vertical coordinate of the quad center
+        :type y:  ``int`` or ``float``
+
+        :param width: the width of the quad
+        :type width:  ``int`` or ``float`` > 0
+
+        :param height: the height of the quad
+        :type height:  ``int`` or ``float`` > 0
+
+        :param source: the image of the quad, or None for the batch image
+        :type source:  ``str`` or ``None``, sharing a texture with the batch image
+
+        :return: the index of the new quad
+        :rtype:  ``int``
+        """
+        assert type(x) in [int,float], '%s is not a number' % repr(x)
+        assert type(y) in [int,float], '%s is not a number' % repr(y)
+        assert type(width)  in [int,float] and width  > 0, '%s is not a valid width'  % repr(width)
+        assert type(height) in [int,float] and height > 0, '%s is not a valid height' % repr(height)
+        assert source is None or self.shares(source), '%s does not share a texture' % repr(source)
+        index = len(self._quads)
+        self._quads.append((float(x),float(y),float(width),float(height),True))
+        self._sources.append(source)
+        self._verts.extend([0.0]*16)
+        base = 4*index
+        self._indices.extend((base,base+1,base+2,base+2,base+3,base))
+        self._grown = True
+        self._place(index)
+        return index
+
+    def move(self,index,x,y):
+        """
+        Moves the quad at the given index so that it is centered at (x,y).
+
+        :param index: the quad index
+        :type index:  ``int`` with 0 <= index < count
+
+        :param x: the horizontal coordinate of the quad center
+        :type x:  ``int`` or ``float``
+
+        :param y: the vertical coordinate of the quad center
+        :type y:  ``int`` or ``float``
+        """
+        (qx,qy,w,h,shown) = self._quads[index]
+        self._quads[index] = (float(x),float(y),w,h,shown)
+        if shown:
+            self._place(index)
+
+    def shift(self,dx,dy):
+        """
+        Moves every quad by (dx,dy).
+
+        :param dx: the horizontal distance to move
+        :type dx:  ``int`` or ``float``
+
+        :param dy: the vertical distance to move
+        :type dy:  ``int`` or ``float``
+        """
+        self._quads = [(x+dx,y+dy,w,h,shown) for (x,y,w,h,shown) in self._quads]
+        verts = self._verts
+        for pos in range(0,len(verts),4):
+            verts[pos]   += dx
+            verts[pos+1] += dy
+        self._dirty = True
+        self._etrue = False
+        self._btrue = False
+
+    def hide(self,index):
+        """
+        Hides the quad at the given index.
+
+        The quad keeps its index and position, and can be shown again with :meth:`show`.
+
+        :param index: the quad index
+        :type index:  ``int`` with 0 <= index < count
+        """
+        (x,y,w,h,shown) = self._quads[index]
+        if shown:
+            self._quads[index] = (x,y,w,h,False)
+            self._place(index)
+
+    def show(self,index):
+        """
+        Shows the quad at the given index again.
+
+        :param index: the quad index
+        :type index:  ``int`` with 0 <= index < count
+        """
+        (x,y,w,h,shown) = self._quads[index]
+        if not shown:
+            self._quads[index] = (x,y,w,h,True)
+            self._place(index)
+
+    def is_shown(self,index):
+        """
+        Checks whether the quad at the given index is visible.
+
+        :param index: the quad index
+        :type index:  ``int`` with 0 <= index < count
+
+        :return: True if the quad is visible
+        :rtype:  ``bool``
+        """
+        return self._quads[index][4]
+
+
+    # HIDDEN METHODS
+    def _place(self,index):
+        """
+        Writes the vertices of the quad at the given index.
+
+        A hidden quad collapses to a point at its center, so it covers no pixels.
+
+        :param index: the quad index
+        :type index:  ``int`` with 0 <= index < count
+        """
+        (x,y,w,h,shown) = self._quads[index]
+        if not shown:
+            w = 0.0
+            h = 0.0
+        uv = self._coords(self._sources[index])
+        left = x-w/2.0
+        right = x+w/2.0
+        bottom = y-h/2.0
+        top = y+h/2.0
+        pos = 16*index
+        self._verts[pos:pos+16] = [left,bottom,uv[0],uv[1], right,bottom,uv[2],uv[3],
+                                   right,top,uv[4],uv[5], left,top,uv[6],uv[7]]
+        self._dirty = True
+        self._etrue = False
+        self._btrue = False
+
+    def _extent(self):
+        """
+        Returns the box (left, bottom, right, top) around the visible quads.
+
+        The box is in the coordinates of the batch, and is read from the vertex list.
+        It is kept until a quad moves, or is hidden or shown.
+        """
+        if not self._etrue:
+            import numpy as np
+            shown = [quad[4] for quad in self._quads]
+            if any(shown):
+                points = np.asarray(self._verts,dtype=float).reshape(-1,4,4)[shown,:,:2]
+                self._box = (float(points[:,:,0].min()),float(points[:,:,1].min()),
+                             float(points[:,:,0].max()),float(points[:,:,1].max()))
+            else:
+                self._box = (0.0,0.0,0.0,0.0)
+            self._etrue = True
+        return self._box
+
+    def _contains_local(self,x,y):
+        """
+        Checks whether the box around the visible quads contains the given points.
+
+        See :meth:`GObject._contains_local`.
+
+        :param x: the horizontal coordinates
+        :type x:  ``float`` or ``numpy`` array
+
+        :param y: the vertical coordinates
+        :type y:  ``float`` or ``numpy`` array
+        """
+        (left,bottom,right,top) = self._extent()
+        return (left < x) & (x < right) & (bottom < y) & (y < top)
+
+    def _build_bounds(self):
+        """
+        Builds the bounding box of this batch.
+
+        This is the box around the visible quads (see :meth:`_extent`), moved by the
+        transform of this batch.
+        """
+        if not self._mtrue or self._matrix is None:
+            self._build_matrix()
+        (left,bottom,right,top) = self._extent()
+        m = self._affine
+        xs = []
+        ys = []
+        for x in (left,right):
+            for y in (bottom,top):
+                xs.append(m[0,0]*x+m[0,1]*y+m[0,2])
+                ys.append(m[1,0]*x+m[1,1]*y+m[1,2])
+        self._bleft   = float(min(xs))
+        self._bright  = float(max(xs))
+        self._bbottom = float(min(ys))
+        self._btop    = float(max(ys))
+        self._btrue = True
+
+    def _flush(self):
+        """
+        Sends the vertex list to the mesh, if any quad changed since the last draw.
+
+        This happens once per frame, however many quads changed.
+        """
+        if self._dirty:
+            self._mesh.vertices = self._verts
+            self._dirty = False
+        if self._grown:
+            self._mesh.indices = self._indices
+            self._grown = False
+
+    def _region(self,source):
+        """
+        Returns the texture of the given image, or None if there is none.
+
+        :param source: the image file name, or None for the batch image
+        :type source:  ``str`` or ``None``
+        """
+        if source is None:
+            source = self.source
+        return None if source is None else GameApp.load_texture(source)
+
+    def _tint(self):
+        """
+        Returns the color instruction that tints the quads, or None for no tint.
+        """
+        return self._fillcolor
+
+    def _coords(self,source):
+        """
+        Returns the texture coordinates of the given image.
+
+        The coordinates are looked up once per image, and kept in ``_texcoords``.
+
+        :param source: the image file name, or None for the batch image
+        :type source:  ``str`` or ``None``
+        """
+        if source in self._texcoords:
+            return self._texcoords[source]
+        texture = self._region(source)
+        coords = (0,0,1,0,1,1,0,1) if texture is None else tuple(texture.tex_coords)
+        self._texcoords[source] = coords
+        return coords
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        GObject._reset(self)
+        texture = self._region(None)
+        
+        # The texture coordinates of each image, with None for the batch image
+        self._texcoords = {None : (0,0,1,0,1,1,0,1)}
+        if texture:
+            # A region binds the whole texture, and has coordinates within it
+            self._texcoords[None] = tuple(texture.tex_coords)
+        for index in range(len(self._quads)):
+            self._place(index)
+
+        self._mesh = Mesh(vertices=self._verts,indices=self._indices,mode='triangles',texture=texture)
+        self._dirty = False
+        self._grown = False
+        tint = self._tint()
+        if not tint is None:
+            self._cache.add(tint)
+        else:
+            self._cache.add(Color(1,1,1))
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
@@ -11,6 +11,7 @@ Date:   August 1, 2017 (Python 3 version)
 from kivy.graphics import *
 from kivy.graphics.instructions import *
 from introcs.geom import Point2, Matrix
+from collections import OrderedDict
 
 def is_color(c):
     """
@@ -37,6 +38,50 @@ def is_color(c):
     return type(c) == str and (introcs.is_tkcolor(c) or introcs.is_webcolor(c))
 
 
+# The named colors converted by to_rgba, least recently used first
+_RGBA_CACHE = OrderedDict()
+# The most colors kept in _RGBA_CACHE
+_RGBA_CACHE_SIZE = 256
+
+def to_rgba(c):
+    """
+    Converts a color to a tuple of four floats (r, g, b, a) between 0 and 1.
+
+    The color may be any value accepted by :func:`is_color`.  A color name (or web
+    color string) is only checked and parsed the first time it is seen.  After that, 
+    the tuple is taken from a cache shared by every object, so assigning a color such 
+    as 'red' again does no parsing.  The cache holds the ``_RGBA_CACHE_SIZE`` names 
+    used most recently.  Tuples and lists are checked and converted every time, as 
+    this needs no parsing, and so are colormodel objects, since they can change.
+
+    :return: The color as an (r, g, b, a) tuple, or None if c is not a color
+    :rtype:  ``tuple`` or ``None``
+
+    :param c: The value to convert
+    :type c:  any
+    """
+    if type(c) == str:
+        if c in _RGBA_CACHE:
+            _RGBA_CACHE.move_to_end(c)
+            return _RGBA_CACHE[c]
+        if not is_color(c):
+            return None
+        import introcs
+        if c[0] == '#':
+            rgba = tuple(introcs.RGB.CreateWebColor(c).glColor())
+        else:
+            rgba = tuple(introcs.RGB.CreateName(c).glColor())
+        _RGBA_CACHE[c] = rgba
+        if len(_RGBA_CACHE) > _RGBA_CACHE_SIZE:
+            _RGBA_CACHE.popitem(last=False)
+        return rgba
+    if not is_color(c):
+        return None
+    if type(c) in [tuple, list]:
+        return tuple(float(z) for z in c)+((1.0,) if len(c) == 3 else ())
+    return tuple(c.glColor())
+
+
 def is_num_tuple(t,size):
     """
     Checks whether a value is a sequence of numbers.
@@ -90,6 +135,9 @@ class GObject(object):
     :class:`GTriangle`, :class:`GPolygon`, or :class:`GPath`.
     """
 
+    # The scene holding this object, or None (see GScene)
+    _parent = None
+
     # MUTABLE PROPERTIES
     @property
     def x(self):
@@ -105,6 +153,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._btrue = False
 
     @property
     def y(self):
@@ -120,6 +169,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._btrue = False
 
     @property
     def width(self):
@@ -137,8 +187,9 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._width = float(value)
+        self._btrue = False
         if self._defined:
-            self._reset()
+            self._resize()
 
     @property
     def height(self):
@@ -156,8 +207,9 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._height = float(value)
+        self._btrue = False
         if self._defined:
-            self._reset()
+            self._resize()
 
     @property
     def scale(self):
@@ -188,6 +240,7 @@ class GObject(object):
             self._scale.x = float(value[0])
             self._scale.y = float(value[1])
         self._mtrue = False
+        self._btrue = False
 
     @property
     def angle(self):
@@ -208,6 +261,7 @@ class GObject(object):
         self._rotate.angle = float(value)
         if not diff:
             self._mtrue = False
+        self._btrue = False
 
     @property
     def linecolor(self):
@@ -230,21 +284,15 @@ class GObject(object):
 
     @linecolor.setter
     def linecolor(self,value):
-        import introcs
-        assert value is None or is_color(value), '%s is not a valid color' % repr(value)
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [introcs.RGB, introcs.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = introcs.RGB.CreateWebColor(value).glColor()
-            else:
-                value = introcs.RGB.CreateName(value).glColor()
-
-        self._linecolor = None if value is None else Color(value[0],value[1],value[2],value[3])
-        if self._defined:
-            self._reset()
+        rgba = None if value is None else to_rgba(value)
+        assert value is None or not rgba is None, '%s is not a valid color' % repr(value)
+        if self._defined and not self._linecolor is None and not rgba is None:
+            self._linecolor.rgba = rgba
+            self._recolor()
+        else:
+            self._linecolor = None if rgba is None else Color(*rgba)
+            if self._defined:
+                self._reset()
 
     @property
     def fillcolor(self):
@@ -268,21 +316,15 @@ class GObject(object):
 
     @fillcolor.setter
     def fillcolor(self,value):
-        import introcs
-        assert value is None or is_color(value), '%s is not a valid color' % repr(value)
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [introcs.RGB, introcs.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = introcs.RGB.CreateWebColor(value).glColor()
-            else:
-                value = introcs.RGB.CreateName(value).glColor()
-
-        self._fillcolor = None if value is None else Color(value[0],value[1],value[2],value[3])
-        if self._defined:
-            self._reset()
+        rgba = None if value is None else to_rgba(value)
+        assert value is None or not rgba is None, '%s is not a valid color' % repr(value)
+        if self._defined and not self._fillcolor is None and not rgba is None:
+            self._fillcolor.rgba = rgba
+            self._recolor()
+        else:
+            self._fillcolor = None if rgba is None else Color(*rgba)
+            if self._defined:
+                self._reset()
 
     @property
     def name(self):
@@ -456,6 +498,27 @@ class GObject(object):
         return self._invrse
 
 
+    # HIDDEN PROPERTIES
+    @property
+    def _btrue(self):
+        """
+        Whether the cached bounding box (see :meth:`_build_bounds`) is up to date.
+
+        Setting this to False also tells the scene holding this object, if any, that
+        its own bounds are out of date.  That scene tells its parent in turn, so a
+        change anywhere in a scene graph reaches the root.
+
+        **invariant**: Value must be a ``bool``
+        """
+        return self._bvalid
+
+    @_btrue.setter
+    def _btrue(self,value):
+        self._bvalid = value
+        if not value and not self._parent is None:
+            self._parent._child_changed()
+
+
     # BUILT-IN METHODS
     def __init__(self,**keywords):
         """
@@ -479,6 +542,9 @@ class GObject(object):
         """
         # Set the properties.
         self._defined = False
+        self._btrue = False
+        self._mtrue = False
+        self._matrix = None
 
         # Create the Kivy transforms for position and size
         self._trans  = Translate(0,0,0)
@@ -545,7 +611,9 @@ class GObject(object):
 
         By default, this method just checks the bounding box of the shape.
 
-        **Warning**: Using this method on a rotated object may slow down your framerate.
+        The point is first moved into the coordinates of the shape.  If the shape is 
+        rotated, this uses the cached inverse transform (see :meth:`contains_many`).  
+        Otherwise it only undoes the position and the scale, which gives the same answer.
 
         :param point: the point to check
         :type point: :class:`Point2` or a pair of numbers
@@ -553,15 +621,43 @@ class GObject(object):
         :return: True if the shape contains this point
         :rtype:  ``bool``
         """
-        import numpy as np
         if isinstance(point,Point2):
             point = (point.x,point.y)
         assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
 
         if self._rotate.angle != 0.0:
-            point = self.matrix.inverse()._transform(point[0],point[1])
+            (x, y) = self._local(point[0],point[1])
+        else:
+            x = (point[0]-self.x)/self._scale.x
+            y = (point[1]-self.y)/self._scale.y
+        return bool(self._contains_local(x,y))
 
-        return abs(point[0]-self.x) < self.width/2.0 and abs(point[1]-self.y) < self.height/2.0
+    def contains_many(self,points):
+        """
+        Checks which of the given points this shape contains
+
+        This method gives the same answers as :meth:`contains`, but for many points at 
+        once.  The points are tested together as ``numpy`` arrays, so there is no Python
+        loop over the points.  The transform of a rotated shape is only computed after 
+        the shape moves, rotates, or is scaled, so testing many points against a rotating
+        shape stays cheap.
+
+        :param points: the points to check
+        :type points: an n x 2 ``numpy`` array, or a sequence of pairs of numbers
+
+        :return: an array whose entry i is True if the shape contains point i
+        :rtype:  ``numpy`` array of ``bool``
+        """
+        import numpy as np
+        points = np.asarray(points,dtype=float)
+        assert points.ndim == 2 and points.shape[1] == 2, "%s is not a valid list of points" % repr(points)
+
+        if self._rotate.angle != 0.0:
+            (x, y) = self._local(points[:,0],points[:,1])
+        else:
+            x = (points[:,0]-self.x)/self._scale.x
+            y = (points[:,1]-self.y)/self._scale.y
+        return self._contains_local(x,y)
 
     def transform(self,point):
         """
@@ -579,41 +675,156 @@ class GObject(object):
         :rtype:  :class:`Point2`
         """
         if isinstance(point,Point2):
-            return self.inverse.transform(point)
-        else:
-            assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
-            p = self.inverse._transform(point[0],point[2])
-            return Point2(p[0],p[1])
+            point = (point.x,point.y)
+        assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
+        (x, y) = self._local(point[0],point[1])
+        return Point2(float(x),float(y))
 
-    def draw(self, view):
+    def draw(self, view, layer=None):
         """
         Draws this shape in the provide view.
 
-        Ideally, the view should be the one provided by :class:`GameApp`.
+        Ideally, the view should be the one provided by :class:`GameApp`.  If ``layer``
+        is given, the shape is drawn to that layer of the view (see the method
+        :meth:`GView.add_layer`).
 
         :param view: view to draw to
         :type view:  :class:`GView`
+
+        :param layer: the layer to draw to, or None for no layer
+        :type layer:  ``str`` (the name of a layer in view) or ``None``
         """
+        self._flush()
         try:
-            view.draw(self._cache)
+            view.draw(self._cache,layer)
         except:
             raise IOError('Cannot draw %s since it was not initialized properly' % repr(self))
 
+    def erase(self, view):
+        """
+        Removes this shape from the provided view.
+
+        This is only needed when the game is in retained mode (see the attribute 
+        ``retained`` of :class:`GameApp`).  In that mode the view is not cleared every
+        frame, so a shape stays on screen after it is drawn until it is erased.  Erasing
+        a shape that is not in the view does nothing.
+
+        :param view: view to erase from
+        :type view:  :class:`GView`
+        """
+        view.erase(self._cache)
+
     # HIDDEN METHODS
     def _reset(self):
         """
         Resets the drawing cache.
+
+        The cache is refilled in place rather than replaced, so a view that holds this
+        object (in retained mode) shows the new instructions without drawing it again.
         """
-        self._cache = InstructionGroup()
+        if getattr(self,'_cache',None) is None:
+            self._cache = InstructionGroup()
+        else:
+            self._cache.clear()
         self._cache.add(PushMatrix())
         self._cache.add(self._trans)
         self._cache.add(self._rotate)
         self._cache.add(self._scale)
+        self._btrue = False
+
+    def _flush(self):
+        """
+        Brings the drawing cache up to date before it is drawn.
+
+        This does nothing by default.  It is for shapes that collect their changes
+        and apply them once per frame, like :class:`GBatch`.
+        """
+        pass
+
+    def _resize(self):
+        """
+        Updates the drawing cache after a change to the width or height.
+
+        By default this resets the drawing cache.  Subclasses that keep the instructions
+        that depend on the size resize those instructions in place instead.
+        """
+        self._reset()
+
+    def _recolor(self):
+        """
+        Updates the drawing cache after a change to the line or fill color.
+
+        A color change is made in place, by changing the existing color instruction, so
+        this method does nothing by default.  Subclasses that copy a color elsewhere
+        (such as the text color of a label) update that copy here.
+        """
+        pass
+
+    def _contains_local(self,x,y):
+        """
+        Checks whether this shape contains points given in its own coordinates.
+
+        In these coordinates the center of the shape is the origin, and the shape is 
+        neither rotated nor scaled.  The values may be numbers, or ``numpy`` arrays of 
+        the same size, so this method must only use operations that work on both.
+
+        :param x: the horizontal coordinates
+        :type x:  ``float`` or ``numpy`` array
+
+        :param y: the vertical coordinates
+        :type y:  ``float`` or ``numpy`` array
+
+        :return: True (or an array of True) for the points in the shape
+        :rtype:  ``bool`` or ``numpy`` array of ``bool``
+        """
+        return (abs(x) < self.width/2.0) & (abs(y) < self.height/2.0)
+
+    def _local(self,x,y):
+        """
+        Returns the given points in the coordinates of this shape.
+
+        This applies the cached inverse transform, which is rebuilt only after the shape
+        moves, rotates, or is scaled.  The values may be numbers, or ``numpy`` arrays of
+        the same size.
+
+        :param x: the horizontal coordinates
+        :type x:  ``float`` or ``numpy`` array
+
+        :param y: the vertical coordinates
+        :type y:  ``float`` or ``numpy`` array
+
+        :return: the pair of transformed coordinates
+        :rtype:  ``tuple``
+        """
+        if not self._mtrue or self._matrix is None:
+            self._build_matrix()
+        inv = self._affinv
+        return (inv[0,0]*x+inv[0,1]*y+inv[0,2], inv[1,0]*x+inv[1,1]*y+inv[1,2])
 
     def _build_matrix(self):
         """
         Builds the transform matrices after a settings change.
+
+        Besides the :class:`Matrix` objects, this caches the 3x3 affine transform and 
+        its inverse as ``numpy`` arrays (``_affine`` and ``_affinv``).  The inverse is 
+        computed directly, not by inverting the matrix.
         """
+        import math
+        import numpy as np
+        radians = math.radians(self._rotate.angle)
+        cos = math.cos(radians)
+        sin = math.sin(radians)
+        sx = self._scale.x
+        sy = self._scale.y
+        tx = self._trans.x
+        ty = self._trans.y
+        self._affine = np.array([[cos*sx, -sin*sy, tx],
+                                 [sin*sx,  cos*sy, ty],
+                                 [0.0, 0.0, 1.0]])
+        self._affinv = np.array([[ cos/sx, sin/sx, -(cos*tx+sin*ty)/sx],
+                                 [-sin/sy, cos/sy,  (sin*tx-cos*ty)/sy],
+                                 [0.0, 0.0, 1.0]])
+
         self._matrix = Matrix()
         self._matrix.translate(self._trans.x,self._trans.y)
         self._matrix.rotate(self._rotate.angle)
@@ -624,6 +835,24 @@ class GObject(object):
         self._invrse.translate(-self._trans.x,-self._trans.y)
         self._mtrue = True
 
+    def _build_bounds(self):
+        """
+        Builds the cached bounding box after a settings change.
+        """
+        import math
+        hw = abs(self.width*self._scale.x)/2.0
+        hh = abs(self.height*self._scale.y)/2.0
+        if self._rotate.angle != 0.0:
+            radians = math.radians(self._rotate.angle)
+            cos = abs(math.cos(radians))
+            sin = abs(math.sin(radians))
+            hw, hh = cos*hw+sin*hh, sin*hw+cos*hh
+        self._bleft   = self._trans.x-hw
+        self._bright  = self._trans.x+hw
+        self._bbottom = self._trans.y-hh
+        self._btop    = self._trans.y+hh
+        self._btrue = True
+
 
 # #mark -
 
@@ -660,7 +889,13 @@ class GScene(GObject):
     @children.setter
     def children(self,value):
         assert is_gobject_list(value), '%s is not a list of valid objects' % repr(value)
+        for child in getattr(self,'_children',[]):
+            if child._parent is self:
+                child._parent = None
         self._children = list(value)
+        for child in self._children:
+            child._parent = self
+        self._child_changed()
         if self._defined:
             self._reset()
 
@@ -676,12 +911,9 @@ class GScene(GObject):
 
         **invariant**: Value must be an ``int`` or ``float`` > 0
         """
-        max = 0
-        for x in self.children:
-            w = x.x+x.width/2.0
-            if w > max:
-                max = w
-        return max*2
+        if not self._ctrue:
+            self._build_children()
+        return 2*max(0.0,-self._cleft,self._cright)
 
     @property
     def height(self):
@@ -693,12 +925,9 @@ class GScene(GObject):
 
         **invariant**: Value must be an ``int`` or ``float`` > 0
         """
-        max = 0
-        for x in self.children:
-            h = x.y+x.height/2.0
-            if h > max:
-                max = h
-        return max*2
+        if not self._ctrue:
+            self._build_children()
+        return 2*max(0.0,-self._cbottom,self._ctop)
 
 
     # BUILT-IN METHODS
@@ -719,6 +948,9 @@ class GScene(GObject):
         :type keywords:  keys are attribute names
         """
         self._defined = False
+        self._bvalid = False
+        self._ctrue = False
+        self._bvh = None
         self.children = keywords['children'] if 'children' in keywords else []
         GObject.__init__(self,**keywords)
         self._reset()
@@ -732,30 +964,186 @@ class GScene(GObject):
 
         This function recursively descends the scene graph.  It returns the first child
         it finds that contains ``point``.  If that child is also a ``GScene``, it
-        recursively calls this method.  If not child contains this point, it returns
-        either this object, or ``None`` if the point is completely out of bounds.
+        recursively searches its children, and moves on to the next child if none of
+        them contain the point.  If not child contains this point, it returns either 
+        this object, or ``None`` if the point is completely out of bounds.
 
-        **Warning**: Using this method on a rotated object may slow down your framerate.
+        The children are found with a bounding volume hierarchy: a tree of boxes, each
+        holding the boxes of up to four children or of two smaller trees.  Only the 
+        children whose boxes contain the point are tested, so selecting in a scene with
+        hundreds of children only tests a few of them.  The tree is rebuilt the next 
+        time this method is called after a child moves or changes.
 
         :param point: the point to check
         :type point: :class:`Point2`` or a pair of numbers
         """
-        if not self.contains(point):
+        if isinstance(point,Point2):
+            point = (point.x,point.y)
+        assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
+        local = self._inside(point[0],point[1])
+        if local is None:
             return None
+        result = self._select(local[0],local[1])
+        return self if result is None else result
 
-        for child in self._children:
+
+    # HIDDEN METHODS
+    def _inside(self,x,y):
+        """
+        Returns the given point in the coordinates of this scene, if it is in bounds.
+
+        :param x: the horizontal coordinate
+        :type x:  ``float``
+
+        :param y: the vertical coordinate
+        :type y:  ``float``
+
+        :return: the transformed point, or ``None`` if it is out of the bounds of the children
+        :rtype:  ``tuple`` or ``None``
+        """
+        if not self._ctrue:
+            self._build_children()
+        (x, y) = self._local(x,y)
+        if not (self._cleft <= x <= self._cright and self._cbottom <= y <= self._ctop):
+            return None
+        return (float(x),float(y))
+
+    def _select(self,x,y):
+        """
+        Returns the first child that contains the given point, or ``None`` if none do.
+
+        Unlike :meth:`select`, this never returns the scene itself, so a nested scene
+        that only covers the point with its bounds does not hide the children after it.
+
+        :param x: the horizontal coordinate, in the coordinates of this scene
+        :type x:  ``float``
+
+        :param y: the vertical coordinate, in the coordinates of this scene
+        :type y:  ``float``
+        """
+        if self._bvh is None:
+            boxes = []
+            for index in range(len(self._children)):
+                child = self._children[index]
+                boxes.append((child._bleft,child._bbottom,child._bright,child._btop,index))
+            self._bvh = self._build_bvh(boxes) if boxes else None
+
+        found = []
+        nodes = [] if self._bvh is None else [self._bvh]
+        while nodes:
+            node = nodes.pop()
+            if node[0] <= x <= node[2] and node[1] <= y <= node[3]:
+                if node[4] is None:
+                    found.extend(node[5])
+                else:
+                    nodes.extend(node[4])
+        found.sort()
+
+        for index in found:
+            child = self._children[index]
             result = None
             if isinstance(child,GScene):
-                result = child.select(point)
-            elif child.contains(point):
+                local = child._inside(x,y)
+                if not local is None:
+                    result = child._select(local[0],local[1])
+            elif child.contains((x,y)):
                 result = child
-            if not child is None:
-                return child
+            if not result is None:
+                return result
 
         return None
 
+    def _child_changed(self):
+        """
+        Marks the bounds of this scene out of date, as one of its children changed.
+        """
+        if self._ctrue or self._bvalid:
+            self._ctrue = False
+            self._bvh = None
+            self._btrue = False
+
+    def _build_children(self):
+        """
+        Builds the box around all of the children, in the coordinates of this scene.
+
+        The box of each child is its cached bounding box, which is only rebuilt if the 
+        child changed.  The box is kept until a child changes (see :meth:`_child_changed`).
+        """
+        left = bottom = right = top = 0.0
+        first = True
+        for child in self._children:
+            if not child._bvalid:
+                child._build_bounds()
+            if first:
+                left, bottom, right, top = child._bleft, child._bbottom, child._bright, child._btop
+                first = False
+            else:
+                left   = min(left,child._bleft)
+                bottom = min(bottom,child._bbottom)
+                right  = max(right,child._bright)
+                top    = max(top,child._btop)
+        self._cleft = left
+        self._cbottom = bottom
+        self._cright = right
+        self._ctop = top
+        self._ctrue = True
+
+    def _build_bvh(self,boxes):
+        """
+        Returns a bounding volume hierarchy for the given boxes.
+
+        Each node is a tuple (left, bottom, right, top, nodes, indices).  A leaf has
+        ``nodes`` None and the list of its child indices in ``indices``.  Any other node
+        has two nodes in ``nodes`` (and ``indices`` None), splitting the boxes in half
+        along the longer side.
+
+        :param boxes: the boxes (left, bottom, right, top, index) of the children
+        :type boxes:  non-empty ``list`` of ``tuple``
+        """
+        left   = min(box[0] for box in boxes)
+        bottom = min(box[1] for box in boxes)
+        right  = max(box[2] for box in boxes)
+        top    = max(box[3] for box in boxes)
+        if len(boxes) <= 4:
+            return (left,bottom,right,top,None,[box[4] for box in boxes])
+
+        axis = 0 if right-left >= top-bottom else 1
+        boxes.sort(key=lambda box: box[axis]+box[axis+2])
+        half = len(boxes)//2
+        return (left,bottom,right,top,(self._build_bvh(boxes[:half]),self._build_bvh(boxes[half:])),None)
+
+    def _build_bounds(self):
+        """
+        Builds the bounding box of this scene.
+
+        This is the box around the children (see :meth:`_build_children`), moved by the 
+        transform of this scene.  It is kept until the scene or one of its children
+        changes.
+        """
+        if not self._ctrue:
+            self._build_children()
+        if not self._mtrue or self._matrix is None:
+            self._build_matrix()
+        m = self._affine
+        xs = []
+        ys = []
+        for x in (self._cleft,self._cright):
+            for y in (self._cbottom,self._ctop):
+                xs.append(m[0,0]*x+m[0,1]*y+m[0,2])
+                ys.append(m[1,0]*x+m[1,1]*y+m[1,2])
+        self._bleft   = float(min(xs))
+        self._bright  = float(max(xs))
+        self._bbottom = float(min(ys))
+        self._btop    = float(max(ys))
+        self._btrue = True
+
+    def _flush(self):
+        """
+        Brings the drawing caches of the children up to date before they are drawn.
+        """
+        for x in self.children:
+            x._flush()
 
-    # HIDDEN METHODS
     def _reset(self):
         """
         Resets the drawing cache
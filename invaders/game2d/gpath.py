@@ -119,6 +119,7 @@ class GPath(GObject):
     def points(self,value):
         assert is_point_tuple(value,2),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._btrue = False
         if self._defined:
             self._reset()
     
@@ -139,7 +140,10 @@ class GPath(GObject):
         assert value >= 0, 'value %s is negative' % repr(value)
         self._linewidth = value
         if self._defined:
-            self._reset()
+            if value > 0 and not self._line is None:
+                self._line.width = value
+            else:
+                self._reset()
     
     
     # IMMUTABLE PROPERTIES
@@ -212,7 +216,23 @@ class GPath(GObject):
         :rtype:  ``bool``
         """
         return False
-    
+
+    def contains_many(self,points):
+        """
+        Checks which of the given points this shape contains
+
+        A path (and its subclasses) tests its points one at a time with :meth:`contains`,
+        as the test depends on the points of the path and not on its transform.
+
+        :param points: the points to check
+        :type points: an n x 2 ``numpy`` array, or a sequence of pairs of numbers
+
+        :return: an array whose entry i is True if the shape contains point i
+        :rtype:  ``numpy`` array of ``bool``
+        """
+        import numpy as np
+        return np.array([self.contains((float(p[0]),float(p[1]))) for p in points],dtype=bool)
+
     def near(self,point):
         """
         Checks whether this path is near the given point
@@ -255,10 +275,11 @@ class GPath(GObject):
         Resets the drawing cache
         """
         GObject._reset(self)
+        self._line = None
         if not self._linecolor is None:
             self._cache.add(self._linecolor)
-            line = Line(points=self.points,cap='round',joint='round',width=self.linewidth)
-            self._cache.add(line)
+            self._line = Line(points=self.points,cap='round',joint='round',width=self.linewidth)
+            self._cache.add(self._line)
         self._cache.add(PopMatrix())
 
 
@@ -297,6 +318,7 @@ class GTriangle(GPath):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         assert len(value) == 6, 'value %s does not have the right length'  %  repr(value)
         self._points = tuple(value)
+        self._btrue = False
         if self._defined:
             self._reset()
     
@@ -363,10 +385,11 @@ class GTriangle(GPath):
         self._cache.add(self._fillcolor)
         self._cache.add(mesh)
         
+        self._line = None
         if self.linewidth > 0:
-            line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
+            self._line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
 
@@ -413,6 +436,7 @@ class GPolygon(GPath):
     def points(self,value):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._btrue = False
         if self._defined:
             self._reset()
     
@@ -581,10 +605,11 @@ class GPolygon(GPath):
         self._cache.add(self._fillcolor)
         self._cache.add(self._mesh)
         
+        self._line = None
         if self.linewidth > 0:
-            line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
+            self._line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
 
@@ -12,8 +12,9 @@ from kivy.graphics import *
 from kivy.graphics.instructions import *
 from kivy.uix.label import Label
 from kivy.uix.image import Image
-from .gobject import GObject, is_num_tuple
+from .gobject import GObject, to_rgba
 from .app import GameApp
+from collections import OrderedDict
 
 class GRectangle(GObject):
     """
@@ -47,7 +48,10 @@ class GRectangle(GObject):
         assert value >= 0, '%s is negative' % repr(value)
         self._linewidth = value
         if self._defined:
-            self._reset()
+            if value > 0 and not self._line is None:
+                self._line.width = value
+            else:
+                self._reset()
     
     
     # BUILT-IN METHODS
@@ -84,18 +88,32 @@ class GRectangle(GObject):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        self._fill = None
         if not self._fillcolor is None:
-            fill = Rectangle(pos=(x,y), size=(self.width, self.height))
+            self._fill = Rectangle(pos=(x,y), size=(self.width, self.height))
             self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._cache.add(self._fill)
         
+        self._line = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
-                        close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                              close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """
+        Resizes the fill and the border in place.
+        """
+        x = -self.width/2.0
+        y = -self.height/2.0
+        if not self._fill is None:
+            self._fill.pos  = (x,y)
+            self._fill.size = (self.width,self.height)
+        if not self._line is None:
+            self._line.rectangle = (x,y,self.width,self.height)
 
 
 # #mark -
@@ -110,6 +128,9 @@ class GEllipse(GRectangle):
     
     This class has exactly the same properties as :class:`GRectangle`.  See the 
     documentation of that class and :class:`GObject` for a complete list of attributes.
+    
+    Unlike the other shapes, :meth:`contains` and :meth:`contains_many` check that a 
+    point is inside the ellipse, not just inside its bounding box.
     """
     
     # BUILT-IN METHODS
@@ -131,36 +152,6 @@ class GEllipse(GRectangle):
         GRectangle.__init__(self,**keywords)
     
     
-    # PUBLIC METHODS
-    def contains(self,point):
-        """
-        Checks whether this shape contains the point
-        
-        This method is better than simple rectangle inclusion.  It checks that the point 
-        is within the proper radius as well.
-        
-        **Warning**: Using this method on a rotated object may slow down your framerate.
-        
-        :param point: the point to check
-        :type point: :class:`GPoint`` or a pair of numbers
-        """
-        if isinstance(point,GPoint):
-            point = (point.x,point.y)
-        assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
-        
-        rx = self.width/2.0
-        ry = self.height/2.0
-        if self._rotate.angle == 0.0:
-            dx = (point[0]-self.x)*(point[0]-self.x)/(rx*rx)
-            dy = (point[1]-self.y)*(point[1]-self.y)/(ry*ry)
-        else:
-            p = self.matrix.inverse()._transform(point[0],point[1])
-            dx = p[0]*p[0]/(rx*rx)
-            dy = p[1]*p[1]/(ry*ry)
-        
-        return (dx+dy) <= 1.0
-    
-    
     # HIDDEN METHODS
     def _reset(self):
         """
@@ -170,17 +161,48 @@ class GEllipse(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        self._fill = None
         if not self._fillcolor is None:
-            fill = Ellipse(pos=(x,y), size=(self.width,self.height))
+            self._fill = Ellipse(pos=(x,y), size=(self.width,self.height))
             self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._cache.add(self._fill)
         
+        self._line = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(ellipse=(x,y,self.width,self.height),close=True,width=self.linewidth)
+            self._line = Line(ellipse=(x,y,self.width,self.height),close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """
+        Resizes the fill and the border in place.
+        """
+        x = -self.width/2.0
+        y = -self.height/2.0
+        if not self._fill is None:
+            self._fill.pos  = (x,y)
+            self._fill.size = (self.width,self.height)
+        if not self._line is None:
+            self._line.ellipse = (x,y,self.width,self.height)
+    
+    def _contains_local(self,x,y):
+        """
+        Checks whether this ellipse contains points given in its own coordinates.
+        
+        This is better than simple rectangle inclusion.  It checks that the points are 
+        within the proper radius as well.  See :meth:`GObject._contains_local`.
+        
+        :param x: the horizontal coordinates
+        :type x:  ``float`` or ``numpy`` array
+        
+        :param y: the vertical coordinates
+        :type y:  ``float`` or ``numpy`` array
+        """
+        rx = self.width/2.0
+        ry = self.height/2.0
+        return (x*x)/(rx*rx)+(y*y)/(ry*ry) <= 1.0
 
 
 # #mark -
@@ -258,17 +280,18 @@ class GImage(GRectangle):
         y = -self.height/2.0
         
         self._texture = GameApp.load_texture(self.source)
-        fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
+        self._fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
         if not self._fillcolor is None:
             self._cache.add(self._fillcolor)
         else:
             self._cache.add(Color(1,1,1))
-        self._cache.add(fill)
+        self._cache.add(self._fill)
         
+        self._line = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
 
@@ -296,7 +319,15 @@ class GLabel(GRectangle):
     to the font by filename, including the .ttf. If you give no name, it will use the 
     default Kivy font.  The `bold` attribute only works for the default Kivy font; for 
     other fonts you will need the .ttf file for the bold version of that font.  See the
-    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
+    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
+    
+    Creating a label renders its text, which is slow.  To show the same message many
+    times, use :meth:`cached` instead of the constructor."""
+    
+    # Class attribute for reusing labels (see cached), least recently used first
+    LABEL_CACHE = OrderedDict()
+    # Class attribute for the most labels kept in LABEL_CACHE
+    LABEL_CACHE_SIZE = 16
     
     # MUTABLE PROPERTIES
     @property
@@ -428,6 +459,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._btrue = False
         self._hanchor = 'center'
         self._ha = value
     
@@ -444,6 +476,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._btrue = False
         self._vanchor = 'center'
         self._hv = value
     
@@ -626,7 +659,72 @@ class GLabel(GRectangle):
         return '%s,text=%s,center=(%s,%s),angle=%s]' \
                 % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
     
+    # CLASS METHODS
+    @classmethod
+    def cached(cls,**keywords):
+        """
+        Returns: A label with the given attributes, reusing a cached one if possible
+        
+        This method takes the same keywords as the constructor.  Labels are cached by
+        all of their keywords, so a label is only reused for a call with exactly the 
+        same keywords and values (colors are compared after conversion, so ``'red'``
+        and ``(1,0,0,1)`` are the same).  Its text is not rendered again.  Otherwise, a
+        new label is made and cached.
+        
+        A cached label should not be changed.  If one of the keyword attributes of a 
+        cached label was changed anyway, it is set back before the label is returned,
+        but any other attribute keeps its changed value.
+        
+        The cache holds at most ``LABEL_CACHE_SIZE`` labels.  When it is full, the 
+        label used least recently is dropped.
+        
+        As the same label may be returned twice, only use this method for labels that
+        are not on screen at the same time as a label with the same keywords.
+        
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        values = {}
+        for name in keywords:
+            values[name] = GLabel._cache_value(name,keywords[name])
+        key = tuple(sorted(values.items()))
+        try:
+            label = cls.LABEL_CACHE.pop(key,None)
+        except TypeError:
+            # A value that cannot be hashed cannot be cached
+            return cls(**keywords)
+        
+        if label is None:
+            label = cls(**keywords)
+            while len(cls.LABEL_CACHE) >= cls.LABEL_CACHE_SIZE:
+                cls.LABEL_CACHE.popitem(last=False)
+        else:
+            for name in keywords:
+                if GLabel._cache_value(name,getattr(label,name)) != values[name]:
+                    setattr(label,name,keywords[name])
+        cls.LABEL_CACHE[key] = label
+        return label
+    
     # HIDDEN METHODS
+    @staticmethod
+    def _cache_value(name,value):
+        """
+        Returns: The value of a keyword attribute, as it is compared in the cache
+        
+        Colors are converted to an rgba tuple, and other lists to tuples.
+        
+        :param name: The attribute name
+        :type name:  ``str``
+        
+        :param value: The attribute value
+        :type value:  any
+        """
+        if name in ['linecolor','fillcolor']:
+            return to_rgba(value)
+        if type(value) == list:
+            return tuple(value)
+        return value
+    
     def _callback(self,instance=None,value=None):
         """
         A workaround to deal with parameter requirements for callbacks
@@ -634,6 +732,19 @@ class GLabel(GRectangle):
         if self._defined:
             self._reset()
     
+    def _resize(self):
+        """
+        Resets the drawing cache, as the text must be aligned again.
+        """
+        self._reset()
+    
+    def _recolor(self):
+        """
+        Updates the text color, which the label keeps separately.
+        """
+        if self.linecolor:
+            self._label.color = self.linecolor
+    
     def _reset(self):
         """
         Resets the drawing cache.
@@ -678,16 +789,18 @@ class GLabel(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        self._fill = None
         if self.fillcolor:
-            fill = Rectangle(pos=(x,y), size=(self.width,self.height))
+            self._fill = Rectangle(pos=(x,y), size=(self.width,self.height))
             self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._cache.add(self._fill)
         
         self._cache.add(self._label.canvas)
         
+        self._line = None
         if self._linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
@@ -153,10 +153,22 @@ class GSprite(GRectangle):
             self._cache.add(Color(1,1,1))
         self._cache.add(self._bounds)
         
+        self._line = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """
+        Resizes the frame and the border in place.
+        """
+        x = -self.width/2.0
+        y = -self.height/2.0
+        self._bounds.pos  = (x,y)
+        self._bounds.size = (self.width,self.height)
+        if not self._line is None:
+            self._line.rectangle = (x,y,self.width,self.height)
 
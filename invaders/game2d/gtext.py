@@ -0,0 +1,240 @@
+"""
+A module to support text that changes every frame.
+
+A :class:`GLabel` renders its text with the font engine whenever the text changes,
+which is too slow for a score that changes every frame.  This module renders every
+character of a font once, into a texture (a glyph atlas).  A string is then drawn as a
+batch of quads, one per character, each showing its character from the atlas.  Changing
+the text only changes the vertices of the quads.
+"""
+from .gbatch import GBatch
+from .app import GameApp
+
+# #mark -
+class GText(GBatch):
+    """
+    A class representing a single line of text drawn from a glyph atlas.
+
+    The attribute `text` defines the text content.  It is drawn in the color `linecolor`,
+    just like a :class:`GLabel`.  Unlike a label, there is no background or border, and
+    the text cannot span several lines.
+
+    The glyphs of a font (a .ttf file in the Fonts folder, refered to by `font_name`)
+    are rendered once per font and point size, when the first text with that font is
+    made, and are shared by every text using them.  Only the characters in ``GLYPHS``
+    are rendered; any other character is drawn as '?'.
+
+    As with :class:`GBatch`, the text is positioned relative to (x,y).  The attribute
+    `halign` says whether the text starts at, is centered on, or ends at x.  The text is
+    always centered vertically on y.  The attributes ``width`` and ``height`` are
+    immutable.
+    """
+
+    # Class attribute for the glyphs of each font, keyed by (font_name, font_size)
+    GLYPH_CACHE = {}
+    # The characters rendered for each font
+    GLYPHS = ''.join(chr(code) for code in range(32,127))
+
+    # MUTABLE PROPERTIES
+    @property
+    def text(self):
+        """
+        The text to draw.
+
+        **Invariant**: Must be a string without the character '\\n'"""
+        return self._text
+
+    @text.setter
+    def text(self,value):
+        assert type(value) == str, 'value %s is not a string' % repr(value)
+        assert not '\n' in value, 'value %s has more than one line' % repr(value)
+        if value != self._text:
+            self._text = value
+            if self._defined:
+                self._layout()
+
+    @property
+    def font_name(self):
+        """
+        The file name for the .ttf file to use as a font, or None for the default font
+
+        **Invariant**: Must be None or a string referring to a .ttf file in folder Fonts"""
+        return self._fname
+
+    @font_name.setter
+    def font_name(self,value):
+        assert value is None or GameApp.is_font(value), 'value %s is not a font name' % repr(value)
+        self._fname = value
+        if self._defined:
+            self._reset()
+            self._layout()
+
+    @property
+    def font_size(self):
+        """
+        The size of the text font in points.
+
+        **Invariant**: Must be a positive number (int or float)"""
+        return self._fsize
+
+    @font_size.setter
+    def font_size(self,value):
+        assert type(value) in [int,float] and value > 0, 'value %s is not a valid size' % repr(value)
+        self._fsize = value
+        if self._defined:
+            self._reset()
+            self._layout()
+
+    @property
+    def halign(self):
+        """
+        The horizontal alignment of the text relative to x.
+
+        If the value is 'left', the text starts at x.  If it is 'right', the text ends
+        at x.  If it is 'center', the text is centered on x.
+
+        **Invariant**: Must be one of 'left', 'center', or 'right'"""
+        return self._halign
+
+    @halign.setter
+    def halign(self,value):
+        assert value in ('left','center','right'), 'value %s is not a valid horizontal alignment' % repr(value)
+        self._halign = value
+        if self._defined:
+            self._layout()
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new line of text.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes.  For example, to show a
+        score in the font ``RetroGame.ttf``, use the constructor call::
+
+            GText(text='SCORE 0',font_name='RetroGame.ttf',font_size=20)
+
+        This class supports the same keywords as :class:`GObject`, though some of them
+        are unused, as the `width` and `height` attributes are now immutable.  The new
+        keywords are ``text``, ``font_name``, ``font_size`` and ``halign``.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._text = ''
+        self.font_name = keywords['font_name'] if 'font_name' in keywords else None
+        self.font_size = keywords['font_size'] if 'font_size' in keywords else 15
+        self.halign = keywords['halign'] if 'halign' in keywords else 'center'
+
+        sanitized = {}
+        excludes  = ['text','font_name','font_size','halign','source']
+        for key in keywords:
+            if not key in excludes:
+                sanitized[key] = keywords[key]
+        if not 'linecolor' in sanitized:
+            sanitized['linecolor'] = (0,0,0,1)
+        GBatch.__init__(self,**sanitized)
+        self.text = keywords['text'] if 'text' in keywords else ''
+
+    def __str__(self):
+        """
+        :return: A readable string representation of this object.
+        :rtype:  ``str``
+        """
+        if self.name is None:
+            s = '['
+        else:
+            s = '[name=%s,' % self.name
+        return '%s,text=%s,center=(%s,%s),angle=%s]' \
+                % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
+
+
+    # CLASS METHODS
+    @classmethod
+    def load_glyphs(cls,font_name,font_size):
+        """
+        Returns: The glyphs of the given font, rendering them if necessary
+
+        The value is a dictionary mapping each character in ``GLYPHS`` to its texture,
+        a region of the glyph atlas.  The key None maps to the glyph atlas itself.  The
+        glyphs are cached in ``GLYPH_CACHE``, so they are only rendered once.
+
+        :param font_name: The font file name, or None for the default font
+        :type font_name:  ``str`` or ``None``
+
+        :param font_size: The size of the font in points
+        :type font_size:  ``int`` or ``float`` > 0
+        """
+        key = (font_name,font_size)
+        if key in cls.GLYPH_CACHE:
+            return cls.GLYPH_CACHE[key]
+
+        from kivy.core.text import Label
+        options = {'font_size' : font_size}
+        if not font_name is None:
+            options['font_name'] = font_name
+        textures = {}
+        for char in cls.GLYPHS:
+            label = Label(text=char,**options)
+            label.refresh()
+            textures[char] = label.texture
+
+        (atlas, regions) = GameApp.pack_textures(textures)
+        glyphs = {None : atlas}
+        for char in regions:
+            glyphs[char] = atlas.get_region(*regions[char])
+        cls.GLYPH_CACHE[key] = glyphs
+        return glyphs
+
+
+    # HIDDEN METHODS
+    def _region(self,source):
+        """
+        Returns the texture of the given character, or None if there is none.
+
+        :param source: the character, or None for the glyph atlas
+        :type source:  ``str`` or ``None``
+        """
+        return GText.load_glyphs(self._fname,self._fsize).get(source)
+
+    def _tint(self):
+        """
+        Returns the color instruction for the text.
+        """
+        return self._linecolor
+
+    def _layout(self):
+        """
+        Places a quad for every character of the text.
+
+        The quads of the previous text are reused, and those that are left over are
+        hidden.  A new quad is only added when the text is longer than any text before.
+        """
+        glyphs = GText.load_glyphs(self._fname,self._fsize)
+        chars = [char if char in glyphs else '?' for char in self._text]
+        total = 0
+        for char in chars:
+            total += glyphs[char].width
+        if self._halign == 'left':
+            left = 0.0
+        elif self._halign == 'right':
+            left = -float(total)
+        else:
+            left = -total/2.0
+
+        for index in range(len(chars)):
+            char = chars[index]
+            width  = float(max(1,glyphs[char].width))
+            height = float(max(1,glyphs[char].height))
+            x = left+width/2.0
+            if index < len(self._quads):
+                self._quads[index] = (x,0.0,width,height,True)
+                self._sources[index] = char
+                self._place(index)
+            else:
+                self.add(x,0.0,width,height,char)
+            left += width
+        for index in range(len(chars),len(self._quads)):
+            self.hide(index)
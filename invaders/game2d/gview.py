@@ -319,6 +319,17 @@ class GView(FloatLayout):
     :class:`GObject` instances to the :meth:`draw` method.  You must do this every
     animation frame, as the game is constantly clearing the window.
 
+    If the game is in retained mode (see the attribute ``retained`` of :class:`GameApp`),
+    the window is not cleared.  A shape is then drawn once and stays in the view (moving
+    whenever its attributes change) until it is erased.
+
+    Shapes that rarely change can be drawn to a named layer instead (see :meth:`add_layer`).
+    Layers are drawn in the order they were added, beneath the shapes drawn without a
+    layer.  They are not cleared with the view, and a cached layer is rendered once to
+    an off-screen framebuffer (a Kivy ``Fbo``).  It is only rendered again when one of
+    its shapes changes, so a frame in which only the uncached shapes move draws each
+    cached layer as a single textured rectangle.
+
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
@@ -337,14 +348,76 @@ class GView(FloatLayout):
         """
         FloatLayout.__init__(self)
         self._frame = InstructionGroup()
+        self._contents = set()
+        self._layers = {}
+        self._order  = []
         self.bind(pos=self._reset)
         self.bind(size=self._reset)
         self._reset()
-        self._contents = set()
 
 
     # PUBLIC METHODS
-    def draw(self,cmd):
+    def add_layer(self,name,cached=True):
+        """
+        Adds a new layer on top of the existing layers.
+
+        A layer holds shapes that are drawn with ``layer=name`` (see the `draw` method in
+        :class:`GObject`).  Every layer is drawn beneath the shapes drawn without a layer,
+        and is not emptied by :meth:`clear`.
+
+        If ``cached`` is True, the layer is rendered to an off-screen framebuffer, and
+        drawn as a single texture.  The framebuffer is rendered again (before the next
+        frame) whenever a shape in the layer is added, erased, or changed, and only then.
+
+        :param name: the name of the layer
+        :type name:  ``str``, not already the name of a layer
+
+        :param cached: whether to render the layer to a framebuffer
+        :type cached:  ``bool``
+        """
+        assert type(name) == str, '%s is not a string' % repr(name)
+        assert not name in self._layers, 'layer %s already exists' % repr(name)
+        assert type(cached) == bool, '%s is not a bool' % repr(cached)
+        group = InstructionGroup()
+        fbo = None
+        if cached:
+            fbo = Fbo(size=self.size,with_stencilbuffer=False)
+            fbo.add(ClearColor(0,0,0,0))
+            fbo.add(ClearBuffers())
+            fbo.add(Scale(dp(1),dp(1),dp(1)))
+            fbo.add(group)
+        self._layers[name] = (group,set(),fbo)
+        self._order.append(name)
+        self._reset()
+
+    def has_layer(self,name):
+        """
+        Checks whether this view has a layer of the given name.
+
+        :param name: the name of the layer
+        :type name:  ``str``
+
+        :return: True if :meth:`add_layer` was called with this name
+        :rtype:  ``bool``
+        """
+        return name in self._layers
+
+    def refresh(self,name):
+        """
+        Marks a cached layer to be rendered again before the next frame.
+
+        This is never needed for a change to a shape, since the layer notices that.
+        It is only needed when something the layer cannot see has changed, such as
+        the pixels of a texture drawn in it.
+
+        :param name: the name of the layer
+        :type name:  ``str``, the name of a layer
+        """
+        fbo = self._layers[name][2]
+        if not fbo is None:
+            fbo.ask_update()
+
+    def draw(self,cmd,layer=None):
         """
         Draws the given Kivy graphics command to this view.
 
@@ -353,20 +426,60 @@ class GView(FloatLayout):
 
         :param cmd: the command to draw
         :type cmd:  A Kivy graphics command
+
+        :param layer: the layer to draw to, or None to draw above every layer
+        :type layer:  ``str`` (the name of a layer) or ``None``
+        """
+        if layer is None:
+            (frame, contents) = (self._frame, self._contents)
+        else:
+            (frame, contents, fbo) = self._layers[layer]
+        if not cmd in contents:
+            frame.add(cmd)
+            contents.add(cmd)
+
+    def erase(self,cmd):
+        """
+        Removes the given Kivy graphics command from this view.
+
+        The command is removed from whichever layer it was drawn to.
+
+        You should never call this method, since you do not understand raw Kivy graphics
+        commands.  Instead, you should use the `erase` method in :class:`GObject` instead.
+
+        :param cmd: the command to erase
+        :type cmd:  A Kivy graphics command
         """
-        if not cmd in self._contents:
-            self._frame.add(cmd)
-            self._contents.add(cmd)
+        if cmd in self._contents:
+            self._frame.remove(cmd)
+            self._contents.remove(cmd)
+            return
+        for name in self._order:
+            (frame, contents, fbo) = self._layers[name]
+            if cmd in contents:
+                frame.remove(cmd)
+                contents.remove(cmd)
+                return
 
-    def clear(self):
+    def clear(self,layer=None):
         """
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame, unless the game is in retained mode.  That way, you are not drawing 
+        images on top of one another.  Only the shapes drawn without a layer are
+        cleared, unless a layer is given.
+
+        :param layer: the layer to clear, or None to clear the shapes without a layer
+        :type layer:  ``str`` (the name of a layer) or ``None``
         """
-        self._frame.clear()
-        self._contents.clear()
+        if layer is None:
+            self._frame.clear()
+            self._contents.clear()
+        else:
+            (frame, contents, fbo) = self._layers[layer]
+            frame.clear()
+            contents.clear()
 
     # HIDDEN METHODS
     def _reset(self,obj=None,value=None):
@@ -378,4 +491,15 @@ class GView(FloatLayout):
         self.canvas.add(Rectangle(pos=self.pos,size=self.size))
         # Work-around for Retina Macs
         self.canvas.add(Scale(dp(1),dp(1),dp(1)))
+        for name in self._order:
+            (group, contents, fbo) = self._layers[name]
+            if fbo is None:
+                self.canvas.add(group)
+            else:
+                # The framebuffer is rendered in pixels, so undo the scale on the copy
+                fbo.size = self.size
+                self.canvas.add(fbo)
+                self.canvas.add(Color(1,1,1))
+                self.canvas.add(Rectangle(pos=(0,0),texture=fbo.texture,
+                                          size=(self.width/dp(1),self.height/dp(1))))
         self.canvas.add(self._frame)
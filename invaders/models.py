@@ -3,20 +3,12 @@ Models module for Alien Invaders
 
 This module contains the model classes for the Alien Invaders game. Anything
 that you interact with on the screen is model: the ship, the laser bolts, and
-the aliens.
+the barriers. The aliens are stored together in a Formation (formation.py).
 
-Just because something is a model does not mean there has to be a special
-class for it. Unless you need something special for your extra gameplay
-features, Ship and Aliens could just be an instance of GImage that you move
-across the screen. You only need a new class when you add extra features to
-an object. So technically Bolt, which has a velocity, is really the only model
-that needs to have its own class.
-
-With that said, we have included the subclasses for Ship and Aliens. That is
-because there are a lot of constants in consts.py for initializing the
-objects, and you might want to add a custom initializer.  With that said,
-feel free to keep the pass underneath the class definitions if you do not want
-to do that.
+The models are plain data. They do not inherit from game2d and never import
+Kivy, so a Wave can be simulated without a window or a graphics context (for
+example in soak tests or when training bots). The module waveview.py mirrors
+the models into game2d objects when the game is played on screen.
 
 You are free to add even more models to this module.  You may wish to do this
 when you add new features to your game, such as power-ups.  If you are unsure
@@ -26,7 +18,6 @@ about whether to make a new class or not, please ask on Piazza.
 # December 8, 2019
 """
 from consts import *
-from game2d import *
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other
 # than consts.py.  If you need extra information from Gameplay, then it should
@@ -34,30 +25,73 @@ from game2d import *
 # calls the method.
 
 
-class Ship(GImage):
+def sweepDistance(bolt,x,y,width,height):
     """
-    A class to represent the game ship.
+    Returns how far bolt moved in its last step before it touched a rectangle.
+
+    A bolt moves straight up or down, from bolt.getLastY() to bolt.getY().
+    Instead of only testing where the bolt ended up, this tests the whole
+    path, so a fast bolt (or a big time step) cannot jump over a thin target.
+    Returns 0 if the bolt was touching the rectangle when it started, and
+    None if it did not touch the rectangle at all.
 
-    At the very least, you want a __init__ method to initialize the ships
-    dimensions. These dimensions are all specified in consts.py.
+    Parameter bolt: The laser bolt to check
+    Precondition: bolt is of class Bolt
 
-    You should probably add a method for moving the ship.  While moving a
-    ship just means changing the x attribute (which you can do directly),
-    you want to prevent the player from moving the ship offscreen.  This
-    is an ideal thing to do in a method.
+    Parameter x: The x coordinate of the center of the rectangle
+    Precondition: x is an int or float
 
-    You also MIGHT want to add code to detect a collision with a bolt. We
-    do not require this.  You could put this method in Wave if you wanted to.
-    But the advantage of putting it here is that Ships and Aliens collide
+    Parameter y: The y coordinate of the center of the rectangle
+    Precondition: y is an int or float
+
+    Parameter width: The width of the rectangle
+    Precondition: width is an int or float >= 0
+
+    Parameter height: The height of the rectangle
+    Precondition: height is an int or float >= 0
+    """
+    if abs(bolt.getX()-x) >= (width+bolt.getWidth())/2:
+        return None
+    # The centers of the bolt that touch the rectangle are in (low, high)
+    reach = (height+bolt.getHeight())/2
+    start = bolt.getLastY()
+    end = bolt.getY()
+    if end >= start:
+        if start >= y+reach or end <= y-reach:
+            return None
+        return max(0,(y-reach)-start)
+    if start <= y-reach or end >= y+reach:
+        return None
+    return max(0,start-(y+reach))
+
+
+class Ship(object):
+    """
+    A class to represent the game ship.
+
+    The ship is a rectangle centered at (x,y) with the ship dimensions in
+    consts.py. It only moves horizontally.
+
+    The advantage of putting collisions here is that Ships and Aliens collide
     with different bolts.  Ships collide with Alien bolts, not Ship bolts.
     And Aliens collide with Ship bolts, not Alien bolts. An easy way to
     keep this straight is for this class to have its own collision method.
-
-    However, there is no need for any more attributes other than those
-    inherited by GImage. You would only add attributes if you needed them
-    for extra gameplay features (like animation).
     """
-    #  IF YOU ADD ATTRIBUTES, LIST THEM BELOW
+    # INSTANCE ATTRIBUTES:
+    # Attribute _x: the x coordinate of the center of the ship
+    # Invariant: _x is a float, 0<=_x<=GAME_WIDTH
+    #
+    # Attribute _y: the y coordinate of the center of the ship
+    # Invariant: _y is a float, 0<=_y<=GAME_HEIGHT
+    #
+    # Attribute _width: the width of the ship
+    # Invariant: _width is a float, 0<=_width<=GAME_WIDTH
+    #
+    # Attribute _height: the height of the ship
+    # Invariant: _height is a float, 0<=_height<=GAME_HEIGHT
+    #
+    # Attribute _lastX: the x coordinate of the ship at the last savePosition
+    # Invariant: _lastX is a float, 0<=_lastX<=GAME_WIDTH
 
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
@@ -65,13 +99,19 @@ class Ship(GImage):
         """
         Returns the x coordinate of the ship
         """
-        return self.x
+        return self._x
 
     def getY(self):
         """
         Returns the y coordinate of the ship
         """
-        return self.y
+        return self._y
+
+    def getLastX(self):
+        """
+        Returns the x coordinate of the ship at the last savePosition
+        """
+        return self._lastX
 
     def setX(self,x):
         """
@@ -81,13 +121,12 @@ class Ship(GImage):
         Precondition: 0<=x<=GAME_WIDTH. x is int or float
         """
         assert 0<=x<=GAME_WIDTH and type(x) in [int,float]
-        self.x = x
+        self._x = float(x)
 
     # INITIALIZER TO CREATE A NEW SHIP
-    def __init__(self,x,y,width,height,source):
+    def __init__(self,x,y,width,height):
         """
-        Initializes the ship's x,y,width,height,source by passing them into
-        the superclass's initializer
+        Initializes the ship's x,y,width,height
 
         Parameter x: The x coordinate of the ship
         Precondition: 0<=x<=GAME_WIDTH. x is int or float
@@ -100,176 +139,93 @@ class Ship(GImage):
 
         Parameter height: The height of the ship
         Precondition: 0<=height<=GAME_HEIGHT. height is int or float
-
-        Parameter source: The image file source
-        Precondition: source is a string
         """
         assert 0<=x<=GAME_WIDTH and type(x) in [int,float]
         assert 0<=y<=GAME_HEIGHT and type(y) in [int,float]
         assert 0<=width<=GAME_WIDTH and type(width) in [int,float]
         assert 0<=height<=GAME_HEIGHT and type(height) in [int,float]
-        assert type(source) == str
-
-        super().__init__(x=x,y=y,width=width,height=height,source=source)
+        self._x = float(x)
+        self._y = float(y)
+        self._width = float(width)
+        self._height = float(height)
+        self._lastX = self._x
 
     # METHODS TO MOVE THE SHIP AND CHECK FOR COLLISIONS
-    def collides(self,bolt):
-        """
-        Returns True if the alien bolt collides with this player
-
-        This method first determines the 4 corners of the bolt.This method
-        returns False if bolt was not fired by the alien or if
-        no collision
-
-        Parameter bolt: The laser bolt to check
-        Precondition: bolt is of class Bolt
-        """
-        assert isinstance(bolt,Bolt)
-
-        if not bolt.isPlayerBolt():
-            c1 = (bolt.getX() + BOLT_WIDTH/2, bolt.getY() + BOLT_HEIGHT/2)
-            c2 = (bolt.getX() + BOLT_WIDTH/2, bolt.getY() - BOLT_HEIGHT/2)
-            c3 = (bolt.getX() - BOLT_WIDTH/2, bolt.getY() + BOLT_HEIGHT/2)
-            c4 = (bolt.getX() - BOLT_WIDTH/2, bolt.getY() - BOLT_HEIGHT/2)
-            return self.contains(c1) or self.contains(c2) or self.contains(c3)\
-            or self.contains(c4)
-        return False
-        # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
-
-
-class Alien(GImage):
-    """
-    A class to represent a single alien.
-
-    At the very least, you want a __init__ method to initialize the alien
-    dimensions. These dimensions are all specified in consts.py.
-
-    You also MIGHT want to add code to detect a collision with a bolt. We
-    do not require this.  You could put this method in Wave if you wanted to.
-    But the advantage of putting it here is that Ships and Aliens collide
-    with different bolts.  Ships collide with Alien bolts, not Ship bolts.
-    And Aliens collide with Ship bolts, not Alien bolts. An easy way to
-    keep this straight is for this class to have its own collision method.
-
-    However, there is no need for any more attributes other than those
-    inherited by GImage. You would only add attributes if you needed them
-    for extra gameplay features (like giving each alien a score value).
-    """
-    #  IF YOU ADD ATTRIBUTES, LIST THEM BELOW
-
-
-    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
-    def getX(self):
+    def savePosition(self):
         """
-        Returns the x coordinate of the alien
+        Remembers the current position, so it can be drawn in between steps
         """
-        return self.x
+        self._lastX = self._x
 
-    def getY(self):
-        """
-        Returns the y coordinate of the alien
-        """
-        return self.y
-
-    def setX(self,x):
+    def contains(self,point):
         """
-        Set the x coordinate of the alien
+        Returns True if the ship contains the point
 
-        Paramter x: The x coordinate to set
-        Precondition: 0<=x<=GAME_WIDTH. x is int or float
-        """
-        assert 0<=x<=GAME_WIDTH and type(x) in [int,float]
-        self.x = x
-
-    def setY(self,y):
+        Parameter point: the point to check
+        Precondition: point is a pair of numbers
         """
-        Set the y coordinate of the alien
+        return abs(point[0]-self._x) < self._width/2.0 and\
+        abs(point[1]-self._y) < self._height/2.0
 
-        Paramter y: The y coordinate to set
-        Precondition: 0<=y<=GAME_HEIGHT. y is int or float
-        """
-        assert 0<=y<=GAME_HEIGHT and type(y) in [int,float]
-        self.y = y
-
-    #INITIALIZER TO CREATE AN ALIEN
-    def __init__(self,x,y,width,height,source):
+    def collides(self,bolt):
         """
-        Initializes the alien's x,y,width,height,source by passing them into
-        the superclass's initializer
-
-        Parameter x: The x coordinate of the alien
-        Precondition: 0<=x<=GAME_WIDTH. x is int or float
-
-        Parameter y: The y coordinate of the alien
-        Precondition: 0<=y<=GAME_HEIGHT. y is int or float
-
-        Parameter width: The width of the alien
-        Precondition: 0<width<=GAME_WIDTH. width is int or float
+        Returns True if the alien bolt collides with this player
 
-        Parameter height: The height of the alien
-        Precondition: 0<=height<=GAME_HEIGHT. height is int or float
+        The whole path of the bolt in its last step is tested (see
+        sweepDistance). This method returns False if bolt was not fired by
+        the alien or if no collision
 
-        Parameter source: The image file source
-        Precondition: source is a string
+        Parameter bolt: The laser bolt to check
+        Precondition: bolt is of class Bolt
         """
-        assert 0<=x<=GAME_WIDTH and type(x) in [int,float]
-        assert 0<=y<=GAME_HEIGHT and type(y) in [int,float]
-        assert 0<=width<=GAME_WIDTH and type(width) in [int,float]
-        assert 0<=height<=GAME_HEIGHT and type(height) in [int,float]
-        assert type(source) == str
-        super().__init__(x=x,y=y,width=width,height=height,source=source)
+        return self.hitDistance(bolt) is not None
 
-    # METHOD TO CHECK FOR COLLISION (IF DESIRED)
-    def collides(self,bolt):
+    def hitDistance(self,bolt):
         """
-        Returns True if the player bolt collides with this alien
-
-        This method first determines the 4 corners of the bolt.This method
-        returns False if bolt was not fired by the player or if
-        no collision.
+        Returns how far the alien bolt moved in its last step before hitting
+        this player, or None if it did not hit.
 
         Parameter bolt: The laser bolt to check
         Precondition: bolt is of class Bolt
         """
         assert isinstance(bolt,Bolt)
-
         if bolt.isPlayerBolt():
-            c1 = (bolt.getX() + BOLT_WIDTH/2, bolt.getY() + BOLT_HEIGHT/2)
-            c2 = (bolt.getX() + BOLT_WIDTH/2, bolt.getY() - BOLT_HEIGHT/2)
-            c3 = (bolt.getX() - BOLT_WIDTH/2, bolt.getY() + BOLT_HEIGHT/2)
-            c4 = (bolt.getX() - BOLT_WIDTH/2, bolt.getY() - BOLT_HEIGHT/2)
-            return self.contains(c1) or self.contains(c2) or self.contains(c3)\
-            or self.contains(c4)
-        return False
-
-    # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
+            return None
+        return sweepDistance(bolt,self._x,self._y,self._width,self._height)
+        # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
 
-class Bolt(GRectangle):
+class Bolt(object):
     """
     A class representing a laser bolt.
 
-    Laser bolts are often just thin, white rectangles. The size of the bolt
-    is determined by constants in consts.py. We MUST subclass GRectangle,
-    because we need to add an extra (hidden) attribute for the velocity of
-    the bolt.
-
-    The class Wave will need to look at these attributes, so you will need
-    getters for them.  However, it is possible to write this assignment with
-    no setters for the velocities.  That is because the velocity is fixed and
-    cannot change once the bolt is fired.
+    Laser bolts are thin rectangles. The size of the bolt is determined by
+    constants in consts.py. A bolt has a velocity in the y direction, which
+    is positive for bolts fired by the player and negative for bolts fired
+    by the aliens.
 
-    In addition to the getters, you need to write the __init__ method to set
-    the starting velocity. This __init__ method will need to call the __init__
-    from GRectangle as a  helper.
-
-    You also MIGHT want to create a method to move the bolt.  You move the
-    bolt by adding the velocity to the y-position.  However, the getter
-    allows Wave to do this on its own, so this method is not required.
+    The class Wave will need to look at these attributes, so there are
+    getters for them.  There is no setter for the velocity. That is because
+    the velocity is fixed and cannot change once the bolt is fired.
     """
     # INSTANCE ATTRIBUTES:
+    # Attribute _x: the x coordinate of the center of the bolt
+    # Invariant: _x is an int or float
+    #
+    # Attribute _y: the y coordinate of the center of the bolt
+    # Invariant: _y is an int or float
+    #
+    # Attribute _width: the width of the bolt
+    # Invariant: _width is an int or float, 0<=_width<=GAME_WIDTH
+    #
+    # Attribute _height: the height of the bolt
+    # Invariant: _height is an int or float, 0<=_height<=GAME_HEIGHT
+    #
     # Attribute _velocity: the velocity in y direction
     # Invariant: _velocity is an int or float
+    #
+    # Attribute _lastY: the y coordinate of the bolt at the last savePosition
+    # Invariant: _lastY is an int or float
 
     # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
 
@@ -279,13 +235,31 @@ class Bolt(GRectangle):
         """
         Returns the bolt X coordinates
         """
-        return self.x
+        return self._x
 
     def getY(self):
         """
         Returns the bolt y coordinates
         """
-        return self.y
+        return self._y
+
+    def getLastY(self):
+        """
+        Returns the bolt y coordinates at the last savePosition
+        """
+        return self._lastY
+
+    def getWidth(self):
+        """
+        Returns the bolt width
+        """
+        return self._width
+
+    def getHeight(self):
+        """
+        Returns the bolt height
+        """
+        return self._height
 
     def setX(self,x):
         """
@@ -295,7 +269,7 @@ class Bolt(GRectangle):
         Precondition: x is an int or float
         """
         assert type(x) in [int,float]
-        self.x=x
+        self._x=x
 
     def setY(self,y):
         """
@@ -305,33 +279,27 @@ class Bolt(GRectangle):
         Precondition: y is an int or float
         """
         assert type(y) in [int,float]
-        self.y=y
+        self._y=y
 
     # INITIALIZER TO SET THE VELOCITY
-    def __init__(self,x,y,width,height,fillcolor,linecolor,velocity):
+    def __init__(self,x,y,width,height,velocity):
         """
         Initializes the class
 
-        Sets x,y,width,height,source from the parent. Sets velocity manually
+        Sets x,y,width,height and velocity
 
-        Parameter x: The x coordinate of the alien
+        Parameter x: The x coordinate of the bolt
         Precondition: 0<=x<=GAME_WIDTH. x is int or float
 
-        Parameter y: The y coordinate of the alien
+        Parameter y: The y coordinate of the bolt
         Precondition: 0<=y<=GAME_HEIGHT. y is int or float
 
-        Parameter width: The width of the alien
+        Parameter width: The width of the bolt
         Precondition: 0<width<=GAME_WIDTH. width is int or float
 
-        Parameter height: The height of the alien
+        Parameter height: The height of the bolt
         Precondition: 0<=height<=GAME_HEIGHT. height is int or float
 
-        Parameter fillcolor: The linecolor of the bolt
-        Precondition: linecolor is a string
-
-        Parameter linecolor: The fillcolor of the bolt
-        Precondition: fillcolor is a string
-
         Parameter velocity: The velocity
         Precondition: velocity is int or float
         """
@@ -339,14 +307,42 @@ class Bolt(GRectangle):
         assert 0<=y<=GAME_HEIGHT and type(y) in [int,float]
         assert 0<=width<=GAME_WIDTH and type(width) in [int,float]
         assert 0<=height<=GAME_HEIGHT and type(height) in [int,float]
-        assert type(fillcolor) == str
-        assert type(linecolor) == str
         assert type(velocity) in [int,float]
-        super().__init__(x=x,y=y,width=width,height=height,\
-        fillcolor=fillcolor,linecolor=linecolor)
+        self._x = x
+        self._y = y
+        self._width = width
+        self._height = height
         self._velocity = velocity
+        self._lastY = y
 
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
+    def fire(self,x,y,velocity):
+        """
+        Fires this bolt again from (x,y) with the given velocity.
+
+        This is how a BoltPool reuses a bolt that has left the game. The
+        width and height of the bolt do not change.
+
+        Parameter x: The x coordinate of the bolt
+        Precondition: 0<=x<=GAME_WIDTH. x is int or float
+
+        Parameter y: The y coordinate of the bolt
+        Precondition: 0<=y<=GAME_HEIGHT. y is int or float
+
+        Parameter velocity: The velocity
+        Precondition: velocity is int or float
+        """
+        self._x = x
+        self._y = y
+        self._velocity = velocity
+        self._lastY = y
+
+    def savePosition(self):
+        """
+        Remembers the current position, so it can be drawn in between steps
+        """
+        self._lastY = self._y
+
     def isPlayerBolt(self):
         """
         Returns whether the bolt is a player's bolt
@@ -357,10 +353,73 @@ class Bolt(GRectangle):
         """
         return self._velocity > 0
 
+
+class BoltPool(object):
+    """
+    A class to recycle laser bolts.
+
+    A wave fires and removes bolts all the time. Instead of creating a new
+    Bolt for every shot, the wave asks the pool for one, and gives it back
+    when the bolt is removed. The pool only creates a new Bolt when all of
+    its bolts are in use.
+
+    A bolt given back to the pool must no longer be used by the wave.
+    """
+    # INSTANCE ATTRIBUTES:
+    # Attribute _free: the bolts that are not in use
+    # Invariant: _free is a list of Bolt objects, possibly empty
+
+    # INITIALIZER TO BUILD THE FIRST BOLTS
+    def __init__(self,size=BOLT_POOL):
+        """
+        Initializes a pool with size bolts ready to fire.
+
+        Parameter size: The number of bolts to build in advance
+        Precondition: size is an int >= 0
+        """
+        assert type(size) == int and size >= 0
+        self._free = [Bolt(x=0,y=0,width=BOLT_WIDTH,height=BOLT_HEIGHT,\
+        velocity=0) for _ in range(size)]
+
+    def acquire(self,x,y,velocity):
+        """
+        Returns a bolt fired from (x,y) with the given velocity.
+
+        Parameter x: The x coordinate of the bolt
+        Precondition: 0<=x<=GAME_WIDTH. x is int or float
+
+        Parameter y: The y coordinate of the bolt
+        Precondition: 0<=y<=GAME_HEIGHT. y is int or float
+
+        Parameter velocity: The velocity
+        Precondition: velocity is int or float
+        """
+        if not self._free:
+            return Bolt(x=x,y=y,width=BOLT_WIDTH,height=BOLT_HEIGHT,\
+            velocity=velocity)
+        bolt = self._free.pop()
+        bolt.fire(x,y,velocity)
+        return bolt
+
+    def release(self,bolt):
+        """
+        Gives bolt back to the pool, so it can be fired again.
+
+        Parameter bolt: The bolt that was removed from the game
+        Precondition: bolt is a Bolt object not in use and not in the pool
+        """
+        self._free.append(bolt)
+
+    def count(self):
+        """
+        Returns the number of bolts ready to fire without creating one
+        """
+        return len(self._free)
+
 # IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
 
 
-class Barrier(GRectangle):
+class Barrier(object):
     """
     A class representing a defense barrier.
 
@@ -372,46 +431,73 @@ class Barrier(GRectangle):
     they are struck with a player or alien bolt.
     """
     # INSTANCE ATTRIBUTES:
+    # Attribute _x: the x coordinate of the center of the barrier
+    # Invariant: _x is an int or float, 0<=_x<=GAME_WIDTH
+    #
+    # Attribute _y: the y coordinate of the center of the barrier
+    # Invariant: _y is an int or float, 0<=_y<=GAME_HEIGHT
+    #
+    # Attribute _width: the width of the barrier
+    # Invariant: _width is an int or float, 0<=_width<=GAME_WIDTH
+    #
+    # Attribute _height: the height of the barrier
+    # Invariant: _height is an int or float, 0<=_height<=GAME_HEIGHT
+    #
     # Attribute _health: the the health of the barrier
     # Invariant: _health is an int or float
 
-    # INITIALIZER TO SET THE VELOCITY
-    def __init__(self,x,y,width,height,fillcolor,linecolor):
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getX(self):
+        """
+        Returns the x coordinate of the barrier
+        """
+        return self._x
+
+    def getY(self):
+        """
+        Returns the y coordinate of the barrier
+        """
+        return self._y
+
+    def getWidth(self):
+        """
+        Returns the width of the barrier
+        """
+        return self._width
+
+    def getHeight(self):
+        """
+        Returns the height of the barrier
+        """
+        return self._height
+
+    # INITIALIZER TO SET THE HEALTH
+    def __init__(self,x,y,width,height):
         """
         Initializes the class
 
-        Sets x,y,width,height,source from the parent. Sets velocity manually
+        Sets x,y,width,height. Sets health to BARRIER_HEALTH
 
-        Parameter x: The x coordinate of the alien
+        Parameter x: The x coordinate of the barrier
         Precondition: 0<=x<=GAME_WIDTH. x is int or float
 
-        Parameter y: The y coordinate of the alien
+        Parameter y: The y coordinate of the barrier
         Precondition: 0<=y<=GAME_HEIGHT. y is int or float
 
-        Parameter width: The width of the alien
+        Parameter width: The width of the barrier
         Precondition: 0<width<=GAME_WIDTH. width is int or float
 
-        Parameter height: The height of the alien
+        Parameter height: The height of the barrier
         Precondition: 0<=height<=GAME_HEIGHT. height is int or float
-
-        Parameter fillcolor: The linecolor of the bolt
-        Precondition: linecolor is a string
-
-        Parameter linecolor: The fillcolor of the bolt
-        Precondition: fillcolor is a string
-
-        Parameter velocity: The velocity
-        Precondition: velocity is int or float
         """
         assert 0<=x<=GAME_WIDTH and type(x) in [int,float]
         assert 0<=y<=GAME_HEIGHT and type(y) in [int,float]
         assert 0<=width<=GAME_WIDTH and type(width) in [int,float]
         assert 0<=height<=GAME_HEIGHT and type(height) in [int,float]
-        assert type(fillcolor) == str
-        assert type(linecolor) == str
-
-        super().__init__(x=x,y=y,width=width,height=height,\
-        fillcolor=fillcolor,linecolor=linecolor)
+        self._x = x
+        self._y = y
+        self._width = width
+        self._height = height
         self._health = BARRIER_HEALTH
 
     def reduceHealth(self,h):
@@ -430,21 +516,35 @@ class Barrier(GRectangle):
         """
         return self._health <= 0
 
+    def contains(self,point):
+        """
+        Returns True if the barrier contains the point
+
+        Parameter point: the point to check
+        Precondition: point is a pair of numbers
+        """
+        return abs(point[0]-self._x) < self._width/2.0 and\
+        abs(point[1]-self._y) < self._height/2.0
+
     def collides(self,bolt):
         """
-        Returns True if the bolt hits any barrier.
+        Returns True if the bolt hits this barrier.
 
-        This method first determines the 4 corners of the bolt.This method
-        returns False if no collision.
+        The whole path of the bolt in its last step is tested (see
+        sweepDistance). This method returns False if no collision.
 
         Parameter bolt: The laser bolt to check
         Precondition: bolt is of class Bolt
         """
-        assert isinstance(bolt,Bolt)
+        return self.hitDistance(bolt) is not None
+
+    def hitDistance(self,bolt):
+        """
+        Returns how far the bolt moved in its last step before hitting this
+        barrier, or None if it did not hit.
 
-        c1 = (bolt.getX() + BOLT_WIDTH/2, bolt.getY() + BOLT_HEIGHT/2)
-        c2 = (bolt.getX() + BOLT_WIDTH/2, bolt.getY() - BOLT_HEIGHT/2)
-        c3 = (bolt.getX() - BOLT_WIDTH/2, bolt.getY() + BOLT_HEIGHT/2)
-        c4 = (bolt.getX() - BOLT_WIDTH/2, bolt.getY() - BOLT_HEIGHT/2)
-        return self.contains(c1) or self.contains(c2) or self.contains(c3)\
-        or self.contains(c4)
+        Parameter bolt: The laser bolt to check
+        Precondition: bolt is of class Bolt
+        """
+        assert isinstance(bolt,Bolt)
+        return sweepDistance(bolt,self._x,self._y,self._width,self._height)
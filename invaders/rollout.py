@@ -0,0 +1,158 @@
+"""
+Rollout module for Alien Invaders
+
+This module plays many headless waves in parallel, for example to score a
+bot. The episodes are fanned out across a pool of worker processes, since a
+single Python process (and the GameApp loop in particular) only ever uses
+one core.
+
+Every episode is a single Wave played from start to finish with its own
+seed, so the results do not depend on the number of workers or on which
+worker played which episode. Each worker creates its own waves and sends
+back one small EpisodeResult per episode.
+
+The policy that plays the game must be picklable (a function defined at the
+top level of a module), as it is sent to the worker processes.
+"""
+from consts import *
+from wave import *
+from collections import namedtuple
+import concurrent.futures
+import random
+
+#: The result of a single episode.
+#:
+#: seed is the seed of the episode, frames the number of frames played,
+#: kills the number of aliens killed, livesLost the number of lives lost,
+#: and status the final value of Wave.getGameOverStatus ('win', 'lose', or
+#: None if the episode ran out of frames).
+EpisodeResult = namedtuple('EpisodeResult',
+    ['seed','frames','kills','livesLost','status'])
+
+# The keys a policy may hold down in a frame
+_KEY_CHOICES = ((),('left',),('right',),('up',),('left','up'),('right','up'))
+
+
+def randomPolicy(wave,rng):
+    """
+    Returns the keys to hold down this frame, chosen at random.
+
+    This is the default policy of the rollouts. A policy is any function
+    with these parameters that returns an iterable of key names.
+
+    Parameter wave: The wave being played
+    Precondition: wave is a Wave object
+
+    Parameter rng: The source of random numbers for the episode
+    Precondition: rng is a random.Random object
+    """
+    return rng.choice(_KEY_CHOICES)
+
+
+def playEpisode(seed,policy=randomPolicy,alienSpeed=ALIEN_SPEED,dt=1/60,
+                maxFrames=100000):
+    """
+    Returns the EpisodeResult of playing a single wave with the given seed.
+
+    The wave plays like it does in Invaders, except that the game resumes
+    right away after the ship is hit (instead of waiting for the player to
+    press 'S'). The episode ends when the wave is won or lost, or after
+    maxFrames frames.
+
+    Parameter seed: The seed of the episode
+    Precondition: seed is an int
+
+    Parameter policy: The player
+    Precondition: policy is a function (see randomPolicy)
+
+    Parameter alienSpeed: The seconds between alien walks
+    Precondition: alienSpeed is an int or float > 0
+
+    Parameter dt: The time in seconds of one frame
+    Precondition: dt is an int or float > 0
+
+    Parameter maxFrames: The most frames to play
+    Precondition: maxFrames is an int > 0
+    """
+    assert type(seed) == int
+    wave = Wave(seed=seed)
+    rng = random.Random(seed)
+    uInput = WaveInput()
+    aliens = wave.getFormation().count()
+
+    frames = 0
+    status = None
+    while status is None and frames < maxFrames:
+        uInput.keys = set(policy(wave,rng))
+        wave.update(uInput,dt,alienSpeed)
+        frames += 1
+        if wave.getShipCollides():
+            wave.setShipCollides(False)
+        status = wave.getGameOverStatus()
+        if wave.getLives() <= 0:
+            status = 'lose'
+
+    return EpisodeResult(seed,frames,aliens-wave.getFormation().count(),
+        SHIP_LIVES-wave.getLives(),status)
+
+
+def iterRollouts(episodes,seed=0,workers=None,chunk=8,**keywords):
+    """
+    Yields the EpisodeResult of each episode as soon as it is finished.
+
+    The episodes have the seeds seed, seed+1, ..., seed+episodes-1. They are
+    split into chunks of up to chunk episodes, and each chunk is played by
+    one worker process. Results come back in the order the chunks finish,
+    not in the order of the seeds.
+
+    Parameter episodes: The number of episodes to play
+    Precondition: episodes is an int >= 0
+
+    Parameter seed: The seed of the first episode
+    Precondition: seed is an int
+
+    Parameter workers: The number of worker processes
+    Precondition: workers is an int > 0, or None for one per CPU
+
+    Parameter chunk: The most episodes sent to a worker at a time
+    Precondition: chunk is an int > 0
+
+    Parameter keywords: The other arguments of playEpisode
+    Precondition: keywords are keyword arguments of playEpisode
+    """
+    assert type(episodes) == int and episodes >= 0
+    assert type(seed) == int
+    assert type(chunk) == int and chunk > 0
+    seeds = list(range(seed,seed+episodes))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_playChunk,seeds[pos:pos+chunk],keywords)
+            for pos in range(0,len(seeds),chunk)]
+        for future in concurrent.futures.as_completed(futures):
+            for result in future.result():
+                yield result
+
+
+def runRollouts(episodes,seed=0,workers=None,chunk=8,**keywords):
+    """
+    Returns the list of EpisodeResults of all episodes, sorted by seed.
+
+    See iterRollouts for the meaning of the parameters.
+    """
+    results = list(iterRollouts(episodes,seed,workers,chunk,**keywords))
+    results.sort(key=lambda result: result.seed)
+    return results
+
+
+def _playChunk(seeds,keywords):
+    """
+    Returns the list of EpisodeResults of playing the given seeds.
+
+    This is the function run by each worker process.
+
+    Parameter seeds: The seeds of the episodes to play
+    Precondition: seeds is a list of ints
+
+    Parameter keywords: The other arguments of playEpisode
+    Precondition: keywords is a dictionary of keyword arguments
+    """
+    return [playEpisode(s,**keywords) for s in seeds]
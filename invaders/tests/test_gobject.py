@@ -0,0 +1,22 @@
+"""
+Regression checks for GObject.contains.
+"""
+import os
+import sys
+
+os.environ.setdefault('KIVY_NO_ARGS','1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG','1')
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game2d.gobject import GObject
+
+
+def test_contains_scaled_shape():
+    shape = GObject(x=100,y=50,width=40,height=20)
+    shape.scale = 2
+    assert shape.contains((135,50))
+    assert not shape.contains((145,50))
+    assert list(shape.contains_many([(135,50),(145,50)])) == [True,False]
+    shape.angle = 1e-3
+    assert shape.contains((135,50))
+    assert not shape.contains((145,50))
@@ -0,0 +1,72 @@
+"""
+Regression checks for GScene.select.
+
+A Kivy Mesh needs a GL context, so the batch used as a child gets a stand-in mesh.
+"""
+import os
+import sys
+
+os.environ.setdefault('KIVY_NO_ARGS','1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG','1')
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.graphics.instructions import Instruction
+import game2d.gbatch
+from game2d.gbatch import GBatch
+from game2d.gobject import GScene
+
+
+class _Mesh(Instruction):
+    """A stand-in for a Kivy Mesh, which cannot be made without a window"""
+    def __init__(self,**keywords):
+        Instruction.__init__(self)
+        self.__dict__.update(keywords)
+
+
+def test_select_default_scene(monkeypatch):
+    monkeypatch.setattr(game2d.gbatch,'Mesh',_Mesh)
+    batch = GBatch()
+    batch.add(10,0,4,4)
+    scene = GScene(children=[batch])
+    assert scene.select((10,0)) is batch
+    assert scene.select((500,500)) is None
+
+
+def _batch(x):
+    """Returns a batch at (x,0) with one 10x10 quad at its origin"""
+    batch = GBatch(x=x)
+    batch.add(0,0,10,10)
+    return batch
+
+
+def test_select_nested_scene(monkeypatch):
+    monkeypatch.setattr(game2d.gbatch,'Mesh',_Mesh)
+    first = _batch(0)
+    last  = _batch(100)
+    inner = GScene(children=[first,last])
+    sibling = _batch(50)
+    scene = GScene(children=[inner,sibling])
+    assert scene.select((0,0)) is first
+    assert scene.select((100,0)) is last
+    assert scene.select((50,0)) is sibling
+    assert scene.select((30,0)) is scene
+    assert scene.select((500,500)) is None
+    assert inner.select((30,0)) is inner
+
+
+def test_select_off_center_batch(monkeypatch):
+    monkeypatch.setattr(game2d.gbatch,'Mesh',_Mesh)
+    batch = GBatch()
+    batch.add(100,50,20,10)
+    batch.add(140,50,20,10)
+    assert (batch.width,batch.height) == (60,10)
+    assert batch.contains((100,50))
+    assert not batch.contains((-100,-50))
+    scene = GScene(children=[batch])
+    assert scene.select((120,50)) is batch
+    assert scene.select((-100,-50)) is None
+    batch.hide(1)
+    assert not batch.contains((140,50))
+    batch.shift(-100,0)
+    assert batch.contains((0,50))
+    assert scene.select((0,50)) is batch
@@ -8,6 +8,10 @@ you move to a new level, you are expected to make a new instance of the class.
 The subcontroller Wave manages the ship, the aliens and any laser bolts on
 screen. These are model objects.  Their classes are defined in models.py.
 
+Wave only holds the rules of the game. It never imports Kivy, so a wave can
+be simulated headless by passing a WaveInput instead of a GInput. To show a
+wave on screen, mirror it with a WaveView (waveview.py).
+
 Most of your work on this assignment will be in either this module or
 models.py. Whether a helper method belongs in this module or models.py is
 often a complicated issue.  If you do not know, ask on Piazza and we will
@@ -16,15 +20,23 @@ answer.
 # Rishi Malhotra (rm725)
 # December 8, 2019
 """
-from game2d import *
 from consts import *
 from models import *
+from formation import *
+from collections import namedtuple
 import random
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Wave is NOT allowed to access anything in app.py (Subcontrollers are not
 # permitted to access anything in their parent. To see why, take CS 3152)
 
+#: A laser bolt hitting something in a single update.
+#:
+#: target is 'barrier', 'alien' or 'ship', and (x,y) is the position of the
+#: bolt when it hit. cell is the (row, col) of the alien for an 'alien' hit,
+#: and None otherwise.
+BoltHit = namedtuple('BoltHit',['target','x','y','cell'])
+
 
 class Wave(object):
     """
@@ -54,14 +66,15 @@ class Wave(object):
     # Attribute _ship: the player ship to control
     # Invariant: _ship is a Ship object or None
     #
-    # Attribute _aliens: the 2d list of aliens in the wave
-    # Invariant: _aliens is a rectangular 2d list containing Alien objects or None
+    # Attribute _formation: the aliens in the wave
+    # Invariant: _formation is a Formation object
     #
     # Attribute _bolts: the laser bolts currently on screen
     # Invariant: _bolts is a list of Bolt objects, possibly empty
     #
-    # Attribute _dline: the defensive line being protected
-    # Invariant : _dline is a GPath object
+    # Attribute _boltPool: the bolts that are not on screen, ready to reuse
+    # Invariant: _boltPool is a BoltPool object. A bolt is never in both
+    # _bolts and _boltPool
     #
     # Attribute _lives: the number of lives left
     # Invariant: _lives is an int >= 0
@@ -92,6 +105,12 @@ class Wave(object):
     # Attribute _shipCollides: Whether a ship has collided
     # Invariant: Is a boolean True or False. True indicates ship collided with
     # bolt. False indicates did not collide with bolt in that frame.
+    #
+    # Attribute _random: The source of random numbers for this wave
+    # Invariant: _random is a random.Random object
+    #
+    # Attribute _hits: The hits of the bolts in the last update
+    # Invariant: _hits is a list of BoltHit objects, possibly empty
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
     def getLives(self):
@@ -112,6 +131,46 @@ class Wave(object):
         """
         return self._shipCollides
 
+    def getShip(self):
+        """
+        Returns the ship, or None if there is no ship
+        """
+        return self._ship
+
+    def getFormation(self):
+        """
+        Returns the formation of aliens
+        """
+        return self._formation
+
+    def getBolts(self):
+        """
+        Returns the laser bolts currently on screen as a tuple
+        """
+        return tuple(self._bolts)
+
+    def getBarriers(self):
+        """
+        Returns the barriers that are not destroyed as a tuple
+        """
+        return tuple(self._barriers)
+
+    def getKills(self):
+        """
+        Returns the number of aliens killed in this wave
+        """
+        formation = self._formation
+        return formation.getRows()*formation.getCols()-formation.count()
+
+    def getHits(self):
+        """
+        Returns the hits of the bolts in the last update as a tuple
+
+        The hits are BoltHit objects. The tuple is empty if no bolt hit
+        anything (or if the wave has not been updated yet).
+        """
+        return tuple(self._hits)
+
     def setGameOverStatus(self,s):
         """
         Sets the game over status to 'win','lose' or none
@@ -135,26 +194,37 @@ class Wave(object):
 
 
     # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
-    def __init__(self):
+    def __init__(self,seed=None):
         """
         Initializes variables essential to the game.
 
-        Initializes the aliens, ships and the defense line, _time,
+        Initializes the aliens, ships and the barriers, _time,
         _alienDirection. Initializes _alienFireRate to a random integer
         between 1 and BOLT_RATE. Sets _bolts to an empty array. Sets
-        _shipCollides to False
+        _shipCollides to False and _gameOverStatus to None
+
+        Two waves created with the same seed (and given the same input)
+        play out exactly the same. If seed is None, the wave is seeded from
+        the operating system.
+
+        Parameter seed: The seed for the random numbers of this wave
+        Precondition: seed is an int or None
         """
+        assert seed is None or type(seed) == int
+        self._random = random.Random(seed)
         self._lives = SHIP_LIVES
         self._time = 0
         self._alienDir = 'right'
         self._setAliens()
         self._setShip()
-        self._setDefenseLine()
         self._setBarrier()
-        self._alienFireRate = random.randint(1,BOLT_RATE)
+        self._alienFireRate = self._random.randint(1,BOLT_RATE)
         self._walks = 0
         self._bolts = []
+        self._boltPool = BoltPool()
         self._shipCollides = False
+        self._gameOverStatus = None
+        self._hits = []
 
     # UPDATE METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
     def update(self,uInput,dt,alienSpeed):
@@ -163,12 +233,14 @@ class Wave(object):
 
         The method updates the ship's location, alien's location. It randomly
         fires alien bolts, fires player bolts when the up arrow key is pressed.
-        It removes alien bolts, and updates the location of all alien bolts. It
+        It then moves the bolts and resolves what they hit in a single pass
+        (see _updateBolts), recording the hits for getHits. It
         also updates the attribute _gameOverStatus if the game is over. It does
         this through calling other methods in this module.
 
         Paramter uInput: The user's input
-        Precondition: uInput is an instance of GInput
+        Precondition: uInput has a method is_key_down (e.g. a GInput or a
+        WaveInput)
 
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
@@ -176,9 +248,10 @@ class Wave(object):
         Parameter alienSpeed: The speed of aliens adjusted for waves
         Precondition: alienSpeed is int or float
         """
-        assert isinstance(uInput,GInput)
+        assert hasattr(uInput,'is_key_down')
         assert type(dt) in [int,float]
         assert type(alienSpeed) in [int,float]
+        self._savePositions()
         if self._ship is not None:
             self._updateShip(uInput)
         if not self._aliensDead():
@@ -188,109 +261,85 @@ class Wave(object):
                 self._walks = 0
         if uInput.is_key_down('up'):
             self._createPlayerBolt()
-        self._removeBolts()
-        self._updateBolts()
-        aliensDead = True
+        self._hits = self._updateBolts()
         self.setGameOverStatus(None)
-        for bolt in self._bolts:
-            self.collisionWithBarrier(bolt)
-            self.collisionWithAliens(bolt)
-            self.collisionWithShip(bolt)
-        for row in self._aliens:
-            for alien in row:
-                if alien is not None and\
-                 alien.getY() - ALIEN_HEIGHT/2 < DEFENSE_LINE:
-                    self.setGameOverStatus('lose')
+        if not self._aliensDead() and self._formation.bottom() < DEFENSE_LINE:
+            self.setGameOverStatus('lose')
         if self._aliensDead():
             self.setGameOverStatus('win')
 
-    # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
-    def draw(self,view):
-        """
-        Draws the ship, aliens, defensive line and bolts to the screen.
-
-        Draws the ship if the ship is not None (if not destroyed).Draws
-        the alien if alien is not destroyed. Draws the barriers too.
-
-        Parameter view: the game view, used in drawing
-        Precondition: view is an instance of GView
-        """
-        assert isinstance(view,GView)
-        for aliens_row in self._aliens:
-            for alien in aliens_row:
-                if alien is not None:
-                    alien.draw(view)
-
-        if self._ship is not None:
-            self._ship.draw(view)
-
-        self._dline.draw(view)
-
-        for bolt in self._bolts:
-            bolt.draw(view)
-
-        for barrier in self._barriers:
-            if not barrier.barrierDestroyed():
-                barrier.draw(view)
-
     # HELPER METHODS FOR COLLISION DETECTION
     def collisionWithBarrier(self,bolt):
         """
-        Carries out tasks if collision between bolt and barrier.
+        Returns True if bolt hits a barrier, carrying out the hit.
 
-        If the barrier is hit by the bolt, then reduce the life of the
+        If a barrier is hit by the bolt, then reduce the life of the
         barrier by BARRIER_HEALTH_DECREMENT. If the barrier is destroyed,
-        then remove it from the self._barriers
+        then remove it from the self._barriers. A bolt hits at most one
+        barrier. The bolt itself is not removed (see _updateBolts).
 
         Parameter bolt: The bolt to check collision with
         Precondition: bolt is an instance of class Bolt
         """
         assert isinstance(bolt,Bolt)
-        if bolt in self._bolts:
-            for barrier in self._barriers:
-                if barrier.collides(bolt):
-                    barrier.reduceHealth(BARRIER_HEALTH_DECREMENT)
-                    self._bolts.remove(bolt)
+        for barrier in self._barriers:
+            if barrier.collides(bolt):
+                barrier.reduceHealth(BARRIER_HEALTH_DECREMENT)
                 if barrier.barrierDestroyed():
                     self._barriers.remove(barrier)
+                return True
+        return False
 
     def collisionWithShip(self,bolt):
         """
-        Carries out tasks if collision between bolt and ship.
+        Returns True if bolt hits the ship, carrying out the hit.
 
-        If alien bolt hits ship, then ship lives reduced by 1, bolt removed
-        and attribute _shipCollides set to True.
+        If alien bolt hits ship, then ship lives reduced by 1 and attribute
+        _shipCollides set to True. The bolt itself is not removed (see
+        _updateBolts).
 
         Parameter bolt: The bolt to check collision with
         Precondition: bolt is an instance of class Bolt
         """
         assert isinstance(bolt,Bolt)
-        if bolt in self._bolts:
-            if self._ship is not None and self._ship.collides(bolt):
-                self._lives -= 1
-                self._bolts.remove(bolt)
-                self._shipCollides = True
+        if self._ship is not None and self._ship.collides(bolt):
+            self._lives -= 1
+            self._shipCollides = True
+            return True
+        return False
 
     def collisionWithAliens(self,bolt):
         """
-        Carries out tasks if collision between bolt and aliens.
+        Returns the (row, col) of the alien bolt kills, or None.
 
-        If ship bolt hits alien, then that alien set to None and bolt
-        removed.
+        If ship bolt hits alien, then that alien is killed in the formation.
+        Only the alien in the formation cell under the bolt is tested (see
+        Formation.cellAt), so the cost does not grow with the size of the
+        formation. The bolt itself is not removed (see _updateBolts).
 
         Parameter bolt: The bolt to check collision with
         Precondition: bolt is an instance of class Bolt
         """
         assert isinstance(bolt,Bolt)
-        if bolt in self._bolts:
-            for row_i in range(ALIEN_ROWS):
-                for col_i in range(ALIENS_IN_ROW):
-                    if self._aliens[row_i][col_i] is not None and\
-                    self._aliens[row_i][col_i].collides(bolt):
-                        self._aliens[row_i][col_i] = None
-                        self._bolts.remove(bolt)
+        cell = self._formation.collides(bolt)
+        if cell is not None:
+            row_i, col_i = cell
+            self._formation.kill(row_i,col_i)
+        return cell
 
     #OTHER HELPER METHODS
+    def _savePositions(self):
+        """
+        Remembers the position of the ship and the bolts before they move.
+
+        A view can then draw them in between the last two updates (see
+        WaveView.draw).
+        """
+        if self._ship is not None:
+            self._ship.savePosition()
+        for bolt in self._bolts:
+            bolt.savePosition()
+
     def _updateShip(self,uInput):
         """
         Updates the x-coordinate of the ship.
@@ -300,9 +349,8 @@ class Wave(object):
         by SHIP_MOVEMENT.
 
         Paramter uInput: The user's input
-        Precondition: uInput is an instance of GInput
+        Precondition: uInput has a method is_key_down
         """
-        assert isinstance(uInput,GInput)
         currentX = self._ship.getX()
         shipLeft = currentX - 0.5 * SHIP_WIDTH
         shipRight = currentX + 0.5 * SHIP_WIDTH
@@ -318,11 +366,12 @@ class Wave(object):
         """
         Updates the x and y of the aliens
 
-        If the alien is not None, then it checks the direction in which
-        alien is moving. If it is moving right, hten adds ALIEN_H_WALK from x.
-        .If left then subtracts ALIEN_H_WALK from x. If 'right-down' or
-        'left-down', then subtracts ALIEN_V_WALK from the Y. Does this only
-        if the time since the last walk is greater than the time alienSpeed.
+        Checks the direction in which the formation is moving. If it is
+        moving right, then adds ALIEN_H_WALK to x. If left then subtracts
+        ALIEN_H_WALK from x. If 'right-down' or 'left-down', then subtracts
+        ALIEN_V_WALK from the y. The whole formation moves in a single
+        march. Does this only if the time since the last walk is greater
+        than the time alienSpeed.
 
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
@@ -336,26 +385,20 @@ class Wave(object):
 
         if self._time > alienSpeed: #if time to walk, then walk
             self._walks += 1
-            for row in self._aliens:
-                for alien in row:
-                    if alien is not None:
-                        alienX = alien.getX()
-                        alienY = alien.getY()
-                        if self._alienDir == 'right':
-                            alien.setX(alienX + ALIEN_H_WALK)
-                        elif self._alienDir == 'left':
-                            alien.setX(alienX - ALIEN_H_WALK)
-                        elif self._alienDir == 'right-down':
-                            alien.setY(alienY - ALIEN_V_WALK)
-                        elif self._alienDir == 'left-down':
-                            alien.setY(alienY - ALIEN_V_WALK)
+            if self._alienDir == 'right':
+                self._formation.march(ALIEN_H_WALK,0)
+            elif self._alienDir == 'left':
+                self._formation.march(-ALIEN_H_WALK,0)
+            else:
+                self._formation.march(0,-ALIEN_V_WALK)
             self._switchAlienDir() #Switch the alien direction
 
     def _switchAlienDir(self):
         """
         Switches the directions in which aliens are moving
 
-        This method first determines the rightmost and the leftmost aliens.
+        This method first determines the right edge of the rightmost and
+        the left edge of the leftmost aliens from the formation.
         If the rightmost alien is past ALIEN_H_WALK from the edge of the
         screen, it changes the direction of the alien.
         If the leftmost alien is within the ALIEN_H_WALK
@@ -365,27 +408,15 @@ class Wave(object):
         to move down on the next walk. 'left-down' means that it is moving
         left and about to move down on the next walk.
         """
-        leftcol = -1; leftrow = -1 #col and row corresponding to the left alien
-        rghtcol = -1; rghtrow = -1 #col and row corresponding to the right alien
-        leftAlienSet = False
-        for col_i in range(ALIENS_IN_ROW):
-            for row_i in range(ALIEN_ROWS):
-                if self._aliens[row_i][col_i] is not None:
-                    rghtrow = row_i
-                    rghtcol = col_i
-                    if not leftAlienSet:
-                        leftrow = row_i
-                        leftcol = col_i
-                        leftAlienSet = True
-        rghtAlienX = self._aliens[rghtrow][rghtcol].getX()
-        leftAlienX = self._aliens[leftrow][leftcol].getX()
+        rghtEdge = self._formation.right()
+        leftEdge = self._formation.left()
         if self._alienDir == 'right-down':
             self._alienDir = 'left'
         elif self._alienDir == 'left-down':
             self._alienDir = 'right'
-        elif(rghtAlienX+ALIEN_WIDTH/2)+ALIEN_H_WALK>(GAME_WIDTH-ALIEN_H_SEP):
+        elif rghtEdge+ALIEN_H_WALK>(GAME_WIDTH-ALIEN_H_SEP):
             self._alienDir += '-down'
-        elif (leftAlienX - ALIEN_WIDTH/2) - ALIEN_H_WALK < ALIEN_H_SEP:
+        elif leftEdge - ALIEN_H_WALK < ALIEN_H_SEP:
             self._alienDir += '-down'
         self._time = 0
 
@@ -393,6 +424,9 @@ class Wave(object):
         """
         Creates a ship bolt and adds it to self._bolts.
 
+        The bolt comes from the bolt pool, so firing does not normally
+        create a new Bolt.
+
         Sets the ship's bolt x to the ship's x. Sets the ship bolt's y to
         ship y + 0.5 * ship height + 0.5 * bolt height. Creates bolts only if
         there is no player bolt present on the screen.
@@ -404,114 +438,131 @@ class Wave(object):
         if not playerBoltPresent:#if no player bolt is present, then create bolt
             boltX = self._ship.getX()
             boltY = self._ship.getY() + SHIP_HEIGHT/2 + BOLT_HEIGHT/2
-            bolt = Bolt(x=boltX,y=boltY,width=BOLT_WIDTH,height=BOLT_HEIGHT,\
-            fillcolor='red',linecolor='red',velocity=BOLT_SPEED)
+            bolt = self._boltPool.acquire(boltX,boltY,BOLT_SPEED)
             self._bolts.append(bolt)
 
     def _createAlienBolts(self):
         """
         Creates alien bolts and adds it to self._bolts
 
-        First finds the columns which have aliens so that columns without
-        aliens don't fire.
+        First picks the lowest alien of a random column with aliens (see
+        Formation.chooseShooter), so that columns without aliens don't fire.
         Sets the alien bolt x to the alien's x coordinate. Set's the bolt y
         coordinate to alien's y - 0.5 * alien height - 0.5 * bolt height.
         Resets the fire rate to a random number between 1 and BOLT_RATE so that
         the bolt rate is random.
         """
-        #finds a random column of aliens where not aliens are not none
-        availableCols = []
-        for col_i in range(ALIENS_IN_ROW):
-            for row_i in range(ALIEN_ROWS):
-                alien = self._aliens[row_i][col_i]
-                if alien is not None and col_i not in availableCols:
-                    availableCols.append(col_i)
-
-        alienCol = random.choice(availableCols)
-        #finds the bottommost alien in that column
-        alienRow = 0
-        for row in range(ALIEN_ROWS):
-            if self._aliens[row][alienCol] is not None:
-                alienRow = row
-
-        alien = self._aliens[alienRow][alienCol]
-        boltX = alien.getX()
-        boltY = alien.getY() - ALIEN_HEIGHT/2 - BOLT_HEIGHT/2
-        bolt = Bolt(x=boltX,y=boltY,width=BOLT_WIDTH,height=BOLT_HEIGHT,\
-        fillcolor='red',linecolor='red',velocity=-BOLT_SPEED)
+        #finds the bottommost alien of a random column that has aliens
+        alienRow, alienCol = self._formation.chooseShooter(self._random)
+
+        boltX = self._formation.getX(alienRow,alienCol)
+        boltY = self._formation.getY(alienRow,alienCol) - ALIEN_HEIGHT/2 \
+        - BOLT_HEIGHT/2
+        bolt = self._boltPool.acquire(boltX,boltY,-BOLT_SPEED)
         self._bolts.append(bolt)
-        self._alienFireRate = random.randint(1,BOLT_RATE)
+        self._alienFireRate = self._random.randint(1,BOLT_RATE)
 
     def _updateBolts(self):
         """
-        Updates the y locations of the bolts
+        Returns the list of BoltHits after moving every bolt once.
+
+        This is the whole life of the bolts in one update, done in a single
+        pass over self._bolts. A bolt that left the screen in the last update
+        is removed. Otherwise the bolt moves by BOLT_SPEED (up for a player
+        bolt, down for an alien bolt) and is then checked against the
+        barriers, the aliens and the ship, in that order. The first hit is
+        carried out, recorded, and the bolt is removed.
+
+        A bolt is removed by moving the last bolt into its place (so the
+        order of self._bolts is not kept). The moved bolt has not been
+        visited yet, so it is handled next and no bolt is skipped. Removed
+        bolts go back to the bolt pool.
+        """
+        hits = []
+        bolts = self._bolts
+        i = 0
+        while i < len(bolts):
+            bolt = bolts[i]
+            spent = self._boltOffScreen(bolt)
+            if not spent:
+                y = bolt.getY()
+                if bolt.isPlayerBolt():
+                    bolt.setY(y+BOLT_SPEED)
+                else:
+                    bolt.setY(y-BOLT_SPEED)
+                hit = self._boltHit(bolt)
+                if hit is not None:
+                    hits.append(hit)
+                    spent = True
+            if spent:
+                bolts[i] = bolts[-1]
+                bolts.pop()
+                self._boltPool.release(bolt)
+            else:
+                i += 1
+        return hits
 
-        Iterates through the bolts array and changes the y coordinate of each
-        bolt. If the bolt is player bolt, adds bolt_speed, else subtracts
-        bolt_speed
+    def _boltOffScreen(self,bolt):
         """
-        for bolt in self._bolts:
-            y = bolt.getY()
-            if bolt.isPlayerBolt():
-                bolt.setY(y+BOLT_SPEED)
-            else:
-                bolt.setY(y-BOLT_SPEED)
+        Returns True if bolt is past the top or the bottom of the screen
 
-    def _removeBolts(self):
+        Parameter bolt: The bolt to check
+        Precondition: bolt is a Bolt object
         """
-        Removes the bolts from self._bolts if the bolt goes past the top of
-        screen
+        return (bolt.getY() - BOLT_HEIGHT/2) > GAME_HEIGHT or\
+        (bolt.getY() + BOLT_HEIGHT/2) < 0
 
-        Checks for each bolt's bottom edge and checks if it is greater than
-        GAME_HEIGHT. If true, then removes the bolt from the self._bolts.
+    def _boltHit(self,bolt):
         """
-        for bolt in self._bolts:
-            if (bolt.getY() - BOLT_HEIGHT/2) > GAME_HEIGHT:
-                self._bolts.remove(bolt)
-            if (bolt.getY() + BOLT_HEIGHT/2) < 0:
-                self._bolts.remove(bolt)
+        Returns the BoltHit of bolt this update, or None if it hit nothing
+
+        The whole path of the bolt in this update is tested against the
+        barriers, the aliens and the ship. If the path crosses more than one
+        of them, only the one the bolt reaches first is hit. The y of the
+        BoltHit is where the bolt was when it hit.
+
+        Parameter bolt: The bolt to check
+        Precondition: bolt is a Bolt object
+        """
+        target = None
+        distance = None
+        for barrier in self._barriers:
+            d = barrier.hitDistance(bolt)
+            if d is not None and (distance is None or d < distance):
+                target, distance = 'barrier', d
+        alien = self._formation.sweep(bolt)
+        if alien is not None and (distance is None or alien[0] < distance):
+            target, distance = 'alien', alien[0]
+        if self._ship is not None:
+            d = self._ship.hitDistance(bolt)
+            if d is not None and (distance is None or d < distance):
+                target, distance = 'ship', d
+
+        if target is None:
+            return None
+        y = bolt.getLastY() + (distance if bolt.isPlayerBolt() else -distance)
+        if target == 'barrier':
+            self.collisionWithBarrier(bolt)
+            return BoltHit('barrier',bolt.getX(),y,None)
+        if target == 'alien':
+            return BoltHit('alien',bolt.getX(),y,self.collisionWithAliens(bolt))
+        self.collisionWithShip(bolt)
+        return BoltHit('ship',bolt.getX(),y,None)
 
     def _aliensDead(self):
         """
         Returns boolean whether all aliens are dead
 
-        Loops through each row in aliens. Loops through each alien in the
-        row. If all aliens are none, then returns True, otherwise returns False.
+        Asks the formation whether any alien is still alive. Returns True if
+        all aliens are dead, otherwise returns False.
         """
-        aliensDead = True
-        for row in self._aliens:
-            for alien in row:
-                if alien != None:
-                    return False
-        return True
+        return self._formation.isEmpty()
 
     def _setAliens(self):
         """
-        Sets the _aliens attribute to a 2d array of aliens.
-
-        The 2d array contains arrays which contains alien objects. These alien
-        objects differ in their x,y and image
+        Sets the _formation attribute to a new formation of aliens.
         """
-        self._aliens = []
-        for row in range(ALIEN_ROWS):
-            #Setting the image corresponding to the alien
-            pos = int((ALIEN_ROWS-row-1)/2)%len(ALIEN_IMAGES)
-
-            #setting alien y coordinate
-            alien_y = (GAME_HEIGHT-ALIEN_CEILING) - (0.5*ALIEN_HEIGHT)\
-            -row*(ALIEN_V_SEP+ALIEN_HEIGHT)
-
-            aliens_row = []
-            for col in range(ALIENS_IN_ROW):
-                #setting alien x coordinate
-                alien_x = ALIEN_H_SEP + 0.5*ALIEN_WIDTH+\
-                 col * (ALIEN_WIDTH + ALIEN_H_SEP)
-
-                alien = Alien(x=alien_x,y=alien_y,width=ALIEN_WIDTH,\
-                height=ALIEN_HEIGHT,source=ALIEN_IMAGES[pos])
-                aliens_row.append(alien)
-
-            self._aliens.append(aliens_row)
+        self._formation = Formation()
 
     def _setShip(self):
         """
@@ -521,21 +572,46 @@ class Wave(object):
         ship_y = SHIP_BOTTOM + SHIP_HEIGHT/2
 
         self._ship = Ship(x=ship_x,y=ship_y,width=SHIP_WIDTH,\
-        height=SHIP_HEIGHT,source='ship.png')
-
-    def _setDefenseLine(self):
-        """
-        Creates a defense line and sets it to the attribute _dline
-        """
-        self._dline = GPath(points=[0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE]\
-        ,linewidth=2,linecolor='black')
+        height=SHIP_HEIGHT)
 
     def _setBarrier(self):
         """
         Creates 2 barriers and stores them in a list the attribute _barriers
         """
         b1 = Barrier(x=GAME_WIDTH/3,y=BARRIER_Y,width=BARRIER_WIDTH,\
-        height=BARRIER_HEIGHT,linecolor='blue',fillcolor='blue')
+        height=BARRIER_HEIGHT)
         b2 = Barrier(x=2*GAME_WIDTH/3,y=BARRIER_Y,width=BARRIER_WIDTH,\
-        height=BARRIER_HEIGHT,linecolor='blue',fillcolor='blue')
+        height=BARRIER_HEIGHT)
         self._barriers = [b1,b2]
+
+
+class WaveInput(object):
+    """
+    A class representing the keyboard for a headless Wave.
+
+    Wave.update only needs to ask whether a key is held down, so this class
+    can stand in for GInput when there is no Kivy window (for example in
+    soak tests or when a bot plays the game). The keys held down are set
+    directly by the caller before each update.
+    """
+    # INSTANCE ATTRIBUTES:
+    # Attribute keys: the keys currently held down
+    # Invariant: keys is a set of strings, possibly empty
+
+    def __init__(self,keys=()):
+        """
+        Initializes the input with the given keys held down.
+
+        Parameter keys: The keys held down
+        Precondition: keys is an iterable of strings
+        """
+        self.keys = set(keys)
+
+    def is_key_down(self,key):
+        """
+        Returns True if key is currently held down
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        return key in self.keys
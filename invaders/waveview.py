@@ -0,0 +1,287 @@
+"""
+View module for Alien Invaders
+
+This module contains the class WaveView, which draws a single wave on the
+screen. Wave only holds the rules of the game and never imports Kivy, so it
+can run headless. WaveView is the optional Kivy side: it mirrors the models
+of a wave (the ship, the formation, the bolts and the barriers) into game2d
+objects and draws them.
+
+A WaveView never changes the wave it mirrors. It only reads the wave through
+its getters, once per draw.
+
+A WaveView works whether or not the game clears the view every frame. In
+retained mode (see GameApp.retained) its objects stay in the view, and the
+view erases each object when it leaves the wave (a dead alien, a spent bolt,
+a destroyed barrier), or all of them when the wave is hidden (see erase).
+
+The defense line and the barriers are drawn to the layer LAYER_STATIC of
+the view, and the formation to the layer LAYER_FORMATION. Both layers are
+cached off screen, so they are only rendered when a barrier is destroyed,
+or the formation walks or loses an alien. The view must have both layers
+(see Invaders.start).
+"""
+from game2d import *
+from consts import *
+
+# PRIMARY RULE: WaveView can only access attributes in wave.py and models.py
+# via getters. It must never change the state of the wave.
+
+
+class WaveView(object):
+    """
+    This class draws a single wave of Alien Invaders.
+
+    Every time it is drawn, the view brings its game2d objects in line with
+    the wave: it moves the ship, drops the aliens that were killed, moves
+    the aliens after a walk, and creates or drops rectangles for bolts that
+    were fired or removed.
+
+    Create a NEW instance of WaveView whenever a new Wave is created.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _wave: the wave being drawn
+    # Invariant: _wave is a Wave object
+    #
+    # Attribute _ship: the image of the player ship
+    # Invariant: _ship is a GImage object
+    #
+    # Attribute _batches: the alien images, one batch for each texture
+    # Invariant: _batches is a list of GBatch objects. Each sprite kind is
+    # drawn by exactly one of them
+    #
+    # Attribute _formation: the node holding the alien batches
+    # Invariant: _formation is a GScene whose children are _batches. Its
+    # (x,y) is the walk offset of the formation, and the alien quads sit at
+    # their fixed positions within it
+    #
+    # Attribute _aliens: the quad of each alien in its batch
+    # Invariant: _aliens is a rectangular 2d list containing (batch, index)
+    # pairs or None. An entry is None once that alien is dead in the
+    # formation (and its quad is hidden).
+    #
+    # Attribute _liveCount: the number of live aliens when the quads were
+    # last hidden
+    # Invariant: _liveCount is an int >= 0
+    #
+    # Attribute _bolts: the rectangles for the bolts drawn in the last frame
+    # Invariant: _bolts is a dictionary mapping Bolt objects to GRectangle
+    # objects
+    #
+    # Attribute _spareRects: bolt rectangles not in use, ready to reuse
+    # Invariant: _spareRects is a list of GRectangle objects, none of them
+    # in _bolts
+    #
+    # Attribute _barriers: the rectangles for the barriers
+    # Invariant: _barriers is a dictionary mapping Barrier objects to
+    # GRectangle objects
+    #
+    # Attribute _dline: the defensive line being protected
+    # Invariant : _dline is a GPath object
+    #
+    # Attribute _view: the view the wave was last drawn to
+    # Invariant: _view is a GView object, or None if the wave is not shown
+    # (it was never drawn, or was erased since)
+
+    # INITIALIZER TO CREATE THE GAME2D OBJECTS
+    def __init__(self,wave):
+        """
+        Initializes the view for the given wave.
+
+        Creates an image for the ship, a quad for every alien in the
+        formation, a rectangle for every barrier, and the defense line.
+
+        Parameter wave: The wave to draw
+        Precondition: wave is a Wave object
+        """
+        self._wave = wave
+        self._ship = GImage(x=GAME_WIDTH/2,y=SHIP_BOTTOM + SHIP_HEIGHT/2,\
+        width=SHIP_WIDTH,height=SHIP_HEIGHT,source='ship.png')
+        self._setAliens()
+        self._bolts = {}
+        self._spareRects = []
+        self._barriers = {}
+        for barrier in wave.getBarriers():
+            self._barriers[barrier] = GRectangle(x=barrier.getX(),\
+            y=barrier.getY(),width=barrier.getWidth(),\
+            height=barrier.getHeight(),linecolor=BARRIER_COLOR,\
+            fillcolor=BARRIER_COLOR)
+        self._dline = GPath(points=[0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE]\
+        ,linewidth=2,linecolor='black')
+        self._view = None
+
+    # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
+    def draw(self,view,alpha=1.0):
+        """
+        Draws the ship, aliens, defensive line and bolts to the screen.
+
+        Draws the ship if the wave has a ship. Draws the alien if alien is
+        not destroyed. Draws the barriers that are not destroyed too.
+        The aliens, the barriers and the defense line go to their cached
+        layers, and the ship and the bolts are drawn above them.
+
+        The ship and the bolts are drawn alpha of the way from where they
+        were before the last update to where they are now. When the game
+        runs in fixed steps, passing GameApp.alpha gives smooth motion at
+        any frame rate. The aliens walk in steps, so they are never drawn
+        in between.
+
+        Parameter view: the game view, used in drawing
+        Precondition: view is an instance of GView
+
+        Parameter alpha: How far to draw between the last two updates
+        Precondition: alpha is an int or float, 0 <= alpha <= 1
+        """
+        assert isinstance(view,GView)
+        assert type(alpha) in [int,float] and 0 <= alpha <= 1
+        self._view = view
+        self._syncAliens()
+        self._formation.draw(view,LAYER_FORMATION)
+
+        ship = self._wave.getShip()
+        if ship is not None:
+            lastX = ship.getLastX()
+            self._ship.x = lastX + alpha*(ship.getX()-lastX)
+            self._ship.draw(view)
+        else:
+            self._ship.erase(view)
+
+        self._dline.draw(view,LAYER_STATIC)
+
+        self._drawBolts(view,alpha)
+
+        for barrier in self._barriers:
+            if barrier.barrierDestroyed():
+                self._barriers[barrier].erase(view)
+            else:
+                self._barriers[barrier].draw(view,LAYER_STATIC)
+
+    def erase(self,view):
+        """
+        Removes everything this view drew from the view.
+
+        This is only needed in retained mode (see GameApp.retained), to hide
+        the wave. It does nothing if the wave is not shown.
+
+        Parameter view: the game view, used in drawing
+        Precondition: view is an instance of GView
+        """
+        assert isinstance(view,GView)
+        if self._view is None:
+            return
+        self._formation.erase(view)
+        self._ship.erase(view)
+        self._dline.erase(view)
+        for rect in self._bolts.values():
+            rect.erase(view)
+        for rect in self._barriers.values():
+            rect.erase(view)
+        self._view = None
+
+    # HELPER METHODS
+    def _setAliens(self):
+        """
+        Sets the _batches and _aliens attributes for the formation.
+
+        Sprite kinds whose images share a texture share a batch. Once the
+        images are packed into an atlas (see GameApp.atlas), the whole
+        formation is a single mesh; otherwise there is one mesh per kind.
+        Either way, no alien is drawn on its own. Every cell of the formation
+        gets a quad in the batch of its kind, placed at the position of that
+        cell before the formation walked. The batches share one GScene, which
+        is moved by the walk offset.
+        """
+        formation = self._wave.getFormation()
+        xs = formation.getLocalXs().tolist()
+        ys = formation.getLocalYs().tolist()
+        kinds = formation.getKinds().tolist()
+        self._batches = []
+        byKind = []
+        for source in ALIEN_IMAGES:
+            batch = None
+            for other in self._batches:
+                if other.shares(source):
+                    batch = other
+            if batch is None:
+                batch = GBatch(source=source)
+                self._batches.append(batch)
+            byKind.append(batch)
+
+        self._aliens = []
+        for row in range(formation.getRows()):
+            aliens_row = []
+            for col in range(formation.getCols()):
+                source = ALIEN_IMAGES[kinds[row][col]]
+                batch = byKind[kinds[row][col]]
+                index = batch.add(xs[row][col],ys[row][col],\
+                ALIEN_WIDTH,ALIEN_HEIGHT,source)
+                aliens_row.append((batch,index))
+            self._aliens.append(aliens_row)
+        offset = formation.getOffset()
+        self._formation = GScene(children=self._batches,\
+        x=float(offset[0]),y=float(offset[1]))
+        self._liveCount = formation.count()
+
+    def _syncAliens(self):
+        """
+        Brings the alien quads in line with the formation.
+
+        Hides the quad of every alien that died. If the formation walked
+        since the last draw, moves the formation node to the new offset.
+        The formation always walks as one block, so this is a single change
+        of translation, and no quad is touched.
+        """
+        formation = self._wave.getFormation()
+        offset = formation.getOffset()
+        if offset[0] != self._formation.x or offset[1] != self._formation.y:
+            self._formation.x = float(offset[0])
+            self._formation.y = float(offset[1])
+
+        if formation.count() == self._liveCount:
+            return
+        alive = formation.getAlive().tolist()
+        for row_i in range(len(self._aliens)):
+            aliens_row = self._aliens[row_i]
+            for col_i in range(len(aliens_row)):
+                alien = aliens_row[col_i]
+                if alien is not None and not alive[row_i][col_i]:
+                    alien[0].hide(alien[1])
+                    aliens_row[col_i] = None
+        self._liveCount = formation.count()
+
+    def _drawBolts(self,view,alpha):
+        """
+        Draws a rectangle for every bolt in the wave.
+
+        Bolts that were drawn in the last frame keep their rectangle, which
+        is moved to the position of the bolt. Rectangles of bolts that are no
+        longer in the wave are erased and kept as spares, and new bolts get a
+        spare rectangle. A new rectangle is only created when there is no
+        spare.
+
+        Parameter view: the game view, used in drawing
+        Precondition: view is an instance of GView
+
+        Parameter alpha: How far to draw between the last two updates
+        Precondition: alpha is an int or float, 0 <= alpha <= 1
+        """
+        bolts = {}
+        for bolt in self._wave.getBolts():
+            lastY = bolt.getLastY()
+            y = lastY + alpha*(bolt.getY()-lastY)
+            rect = self._bolts.pop(bolt,None)
+            if rect is None and self._spareRects:
+                rect = self._spareRects.pop()
+            if rect is None:
+                rect = GRectangle(x=bolt.getX(),y=y,\
+                width=bolt.getWidth(),height=bolt.getHeight(),\
+                fillcolor=BOLT_COLOR,linecolor=BOLT_COLOR)
+            else:
+                rect.x = bolt.getX()
+                rect.y = y
+            rect.draw(view)
+            bolts[bolt] = rect
+        for rect in self._bolts.values():
+            rect.erase(view)
+            self._spareRects.append(rect)
+        self._bolts = bolts